@@ -1,33 +1,415 @@
 #!/usr/bin/env python3
 """EmotionSim CLI - Monitor and run simulations from the command line"""
 import asyncio
+import concurrent.futures
+import copy
 import json
+import random
 import signal
+import subprocess
 import sys
-from typing import Any
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Coroutine
+from urllib.parse import urlsplit
+from uuid import UUID
 
 import click
-from rich.console import Console
+from rich.console import Console, Group
 from rich.live import Live
-from rich.prompt import Prompt, Confirm
+from rich.prompt import Prompt, IntPrompt, Confirm, PromptBase
 from rich.table import Table
+from rich.text import Text
 from rich import box
 import httpx
+import orjson
+import websockets
+from sqlalchemy import bindparam, case, event, func, inspect, select, update, asc, desc
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
+from sqlalchemy.orm import joinedload
 
 from app.cli_monitor import EventRenderer, SimpleEventLogger
 from app.core.config import get_settings
+from app.core.database import Base, json_deserializer, json_serializer
+from app.models.scenario import Scenario
+from app.models.run import Run, RunStatus
+from app.scenarios.defaults import DEFAULT_SCENARIOS
+from app.scenarios.storage import SCENARIOS_DIR, load_generated_scenarios
+
+# Built-in scenarios keyed by lowercased name, built once for case-insensitive lookups
+_DEFAULT_SCENARIOS_LOWER = {name.lower(): (name, func) for name, func in DEFAULT_SCENARIOS.items()}
+
+# Most pending runs the auto loop claims per poll
+_PENDING_BATCH = 8
+
+# Statements the auto loop runs every cycle, built once; the engine's compiled cache
+# then reuses their SQL, which only needs their cache key (not a fresh construct)
+# Claiming moves the oldest pending runs to RUNNING in one UPDATE, so no other auto
+# loop can pick them up; rows another worker is claiming right now are skipped where
+# the backend supports SKIP LOCKED (SQLite serializes writers instead)
+_CLAIM_PENDING_RUNS_STMT = (
+    update(Run)
+    .where(
+        Run.status == RunStatus.PENDING,
+        Run.id.in_(
+            select(Run.id)
+            .where(Run.status == RunStatus.PENDING)
+            .order_by(asc(Run.created_at))
+            .limit(bindparam("limit"))
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        ),
+    )
+    .values(status=RunStatus.RUNNING)
+    .returning(
+        Run.id,
+        select(Scenario.name).where(Scenario.id == Run.scenario_id).scalar_subquery(),
+        Run.created_at,
+    )
+    .execution_options(synchronize_session=False)
+)
+# Claimed runs the auto loop stops before executing go back to PENDING, unless
+# something else has picked them up in the meantime
+_RELEASE_CLAIMED_RUNS_STMT = (
+    update(Run)
+    .where(
+        Run.id.in_(bindparam("run_ids", expanding=True)),
+        Run.status == RunStatus.RUNNING,
+        Run.current_step == 0,
+    )
+    .values(status=RunStatus.PENDING)
+    .execution_options(synchronize_session=False)
+)
+_SCENARIO_BY_NAME_STMT = select(Scenario).where(Scenario.name == bindparam("name")).limit(1)
+_SCENARIO_EXISTS_STMT = select(Scenario.id).where(Scenario.id == bindparam("scenario_id"))
+_RUN_WITH_SCENARIO_STMT = (
+    select(Run)
+    .options(joinedload(Run.scenario))
+    .where(Run.id == bindparam("run_id"))
+    # Always read the stored status: another process may have changed it
+    .execution_options(populate_existing=True)
+)
+
+# Scenario picker rows: no JSON columns beyond the agent count the menu shows
+_SCENARIO_MENU_STMT = select(
+    Scenario.id,
+    Scenario.name,
+    func.coalesce(func.json_array_length(Scenario.agent_templates), 0).label("agents"),
+)
+
+# Auto-run presets, and the DB scenario each resolves to: name -> (id, name, max_steps).
+# Filled lazily by the auto loop; entries are checked before use, as rows can be deleted.
+_PRESET_NAMES: tuple[str, ...] = tuple(DEFAULT_SCENARIOS)
+_PRESET_SCENARIO_CACHE: dict[str, tuple[str, str, int]] = {}
+
+
+# Server keepalive frames; "event" is always the first key, with or without a space
+_KEEPALIVE_PREFIXES = (
+    '{"event":"ping"', '{"event": "ping"',
+    '{"event":"pong"', '{"event": "pong"',
+)
+_KEEPALIVE_BYTE_PREFIXES = tuple(prefix.encode() for prefix in _KEEPALIVE_PREFIXES)
+
+
+def _is_keepalive(message: str | bytes) -> bool:
+    """Whether a monitor frame, text or binary, is a server keepalive"""
+    if isinstance(message, str):
+        return message.startswith(_KEEPALIVE_PREFIXES)
+    return message.startswith(_KEEPALIVE_BYTE_PREFIXES)
+
+
+# Monitor connection: step_completed frames carry every message of the step, so allow
+# frames well past the 1 MiB default and buffer enough of them to ride out slow redraws
+_WS_CONNECT_OPTIONS: dict[str, Any] = {
+    "max_size": 8 * 1024 * 1024,
+    "max_queue": 64,
+}
+
+
+def _find_default_scenario(scenario_name: str) -> str | None:
+    """Find a built-in scenario name by exact, then partial, case-insensitive match"""
+    query = scenario_name.lower()
+    match = _DEFAULT_SCENARIOS_LOWER.get(query)
+    if match is None:
+        match = next((entry for key, entry in _DEFAULT_SCENARIOS_LOWER.items() if query in key), None)
+    return match[0] if match else None
+
+
+@lru_cache
+def _preset_payload(name: str) -> dict[str, Any]:
+    """Column values for a built-in scenario, dumped from its creator once per process"""
+    scenario_create = DEFAULT_SCENARIOS[name]()
+    return {
+        "name": scenario_create.name,
+        "description": scenario_create.description,
+        "config": scenario_create.config.model_dump(),
+        "agent_templates": [t.model_dump() for t in scenario_create.agent_templates],
+    }
+
+
+def _new_preset_scenario(name: str) -> Scenario:
+    """Build a Scenario row for a built-in scenario from its cached payload"""
+    # Copied because callers mutate config (e.g. max_steps overrides)
+    return Scenario(**copy.deepcopy(_preset_payload(name)))
+
+
+# Generated scenario files parsed once per invocation, keyed on their mtimes, together
+# with a lowercase name index: (key, scenarios, {name.lower(): scenario})
+_generated_cache: tuple[
+    tuple[tuple[str, int], ...], list[dict[str, Any]], dict[str, dict[str, Any]]
+] | None = None
+
+
+def _load_generated() -> tuple[list[dict[str, Any]], dict[str, dict[str, Any]]]:
+    """Generated scenarios and their name index, re-read only when the files on disk change"""
+    global _generated_cache
+    try:
+        key = tuple(
+            (path.name, path.stat().st_mtime_ns) for path in sorted(SCENARIOS_DIR.glob("*.json"))
+        )
+    except OSError:
+        key = None
+    if key is None or _generated_cache is None or _generated_cache[0] != key:
+        scenarios = load_generated_scenarios()
+        # Newest first, so the newest file wins a shared name
+        index: dict[str, dict[str, Any]] = {}
+        for entry in scenarios:
+            index.setdefault(entry["name"].lower(), entry)
+        _generated_cache = (key, scenarios, index) if key is not None else None
+        return scenarios, index
+    return _generated_cache[1], _generated_cache[2]
+
+
+def _generated_scenarios() -> list[dict[str, Any]]:
+    """load_generated_scenarios(), re-read only when the files on disk change"""
+    return _load_generated()[0]
+
+
+def _find_generated_scenario(scenario_name: str) -> dict[str, Any] | None:
+    """Find a generated scenario by exact, then partial, case-insensitive name, or by filename"""
+    scenarios, index = _load_generated()
+    query = scenario_name.lower()
+    match = index.get(query)
+    if match is None:
+        match = next(
+            (s for s in scenarios if scenario_name in s["filename"] or query in s["name"].lower()),
+            None,
+        )
+    return match
+
+
+def _new_generated_scenario(data: dict[str, Any]) -> Scenario:
+    """Build a Scenario row from a (cached) generated scenario entry"""
+    return Scenario(
+        name=data["name"],
+        description=data["description"],
+        config=copy.deepcopy(data["config"]),
+        agent_templates=copy.deepcopy(data["agent_templates"]),
+    )
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Use WAL with relaxed fsyncs for the CLI's commit-heavy SQLite workload"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
+@lru_cache
+def _get_engine() -> AsyncEngine:
+    """Get the CLI's shared database engine (no SQL echo, unlike the server's)"""
+    settings = get_settings()
+    if settings.database_url.startswith("sqlite"):
+        engine = create_async_engine(
+            settings.database_url,
+            echo=False,
+            json_serializer=json_serializer,
+            json_deserializer=json_deserializer,
+        )
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+        return engine
+    # Pool sizing only applies to server databases; SQLite serializes writes anyway
+    return create_async_engine(
+        settings.database_url,
+        echo=False,
+        pool_size=10,
+        max_overflow=5,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        json_serializer=json_serializer,
+        json_deserializer=json_deserializer,
+    )
+
+
+@lru_cache
+def _get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Get the session factory bound to the shared CLI engine"""
+    return async_sessionmaker(_get_engine(), class_=AsyncSession, expire_on_commit=False)
+
+
+_schema_ready = False
+
+
+def _create_missing_tables(connection) -> None:
+    """Create missing tables and indexes; a few catalog queries on a warm DB"""
+    inspector = inspect(connection)
+    existing = set(inspector.get_table_names())
+    if not existing.issuperset(Base.metadata.tables):
+        Base.metadata.create_all(connection)
+    # create_all skips existing tables, and with them any index declared since
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing or not table.indexes:
+            continue
+        present = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in present:
+                index.create(connection)
+
+
+async def _ensure_schema() -> None:
+    """Create missing tables, at most once per process"""
+    global _schema_ready
+    if _schema_ready:
+        return
+    async with _get_engine().begin() as conn:
+        await conn.run_sync(_create_missing_tables)
+    _schema_ready = True
+
+
+@asynccontextmanager
+async def _db_session() -> AsyncIterator[AsyncSession]:
+    """Open a session on the shared CLI engine, creating the schema on first use"""
+    await _ensure_schema()
+    async with _get_sessionmaker()() as db:
+        yield db
+
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get the HTTP client shared by the running command, keeping connections alive"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=5.0,
+            limits=httpx.Limits(max_keepalive_connections=5, keepalive_expiry=30.0),
+        )
+    return _http_client
+
+
+async def _close_http_client() -> None:
+    """Close the shared HTTP client, if one was opened"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def _run_command(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a command coroutine, closing the shared HTTP client before its event loop ends"""
+    async def runner():
+        try:
+            return await coro
+        finally:
+            await _close_http_client()
+    return asyncio.run(runner())
+
+
+# Live display redraws: at most 10 per second while events arrive. Idle checks back off
+# to the tick, which also redraws the clock and stream cursor
+_LIVE_TICK = 0.5
+_LIVE_MIN_INTERVAL = 1 / 10
+
+
+async def _drive_live_display(
+    live: Live,
+    renderer: EventRenderer,
+    task: asyncio.Task,
+    stop: asyncio.Event | None = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> None:
+    """Redraw the layout when the renderer is dirty until the task ends or a stop is requested"""
+    waiters: set[asyncio.Future] = {task}
+    if stop is not None:
+        waiters.add(asyncio.ensure_future(stop.wait()))
+    last_draw = clock()
+    try:
+        while not task.done() and not (stop is not None and stop.is_set()):
+            # Sleep until the renderer has something new, waking only for the idle tick
+            updated = asyncio.ensure_future(renderer.updated.wait())
+            try:
+                await asyncio.wait(waiters | {updated}, timeout=_LIVE_TICK, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                updated.cancel()
+            since_draw = clock() - last_draw
+            if not renderer.updated.is_set():
+                if since_draw < _LIVE_TICK:
+                    continue
+            elif since_draw < _LIVE_MIN_INTERVAL:
+                # Let a burst of events and tokens coalesce into one redraw
+                await asyncio.wait(waiters, timeout=_LIVE_MIN_INTERVAL - since_draw)
+            renderer.consume_dirty()
+            live.update(renderer.render_layout(), refresh=True)
+            last_draw = clock()
+    finally:
+        for waiter in waiters - {task}:
+            waiter.cancel()
+
+
+async def _ask(prompt_type: type[PromptBase], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking Rich prompt off the event loop so background tasks keep going"""
+    # A daemon thread rather than the default executor: asyncio.run() joins executor
+    # threads on exit, so Ctrl+C at a prompt would otherwise wait for Enter
+    answer: concurrent.futures.Future = concurrent.futures.Future()
+
+    def ask() -> None:
+        if not answer.set_running_or_notify_cancel():
+            return
+        try:
+            answer.set_result(prompt_type.ask(*args, **kwargs))
+        except BaseException as exc:
+            answer.set_exception(exc)
+
+    threading.Thread(target=ask, daemon=True).start()
+    return await asyncio.wrap_future(answer)
+
+
+async def _ask_index(prompt: str, count: int) -> int:
+    """Ask for a menu number from 1 to count and return its 0-based index"""
+    # A range check instead of Prompt choices, which lists every option in the prompt
+    while True:
+        choice = await _ask(IntPrompt, prompt, default=1)
+        if 1 <= choice <= count:
+            return choice - 1
+        console.print(f"[red]Please enter a number from 1 to {count}[/red]")
+
+
+# Ollama model names from the last successful listing: (time.monotonic() stamp, names)
+_MODEL_LIST_TTL = 60.0
+_model_list_cache: tuple[float, list[str]] | None = None
 
 
 async def check_model_selection():
     """Ensure a valid model is selected and available"""
+    global _model_list_cache
     settings = get_settings()
     base_url = settings.ollama_base_url
     default_model = settings.ollama_default_model
     
     try:
-        async with httpx.AsyncClient() as client:
-            try:
-                # List models
+        client = _get_http_client()
+        try:
+            # List models, reusing a recent listing (the installed models rarely change)
+            if _model_list_cache is not None and time.monotonic() - _model_list_cache[0] < _MODEL_LIST_TTL:
+                models = _model_list_cache[1]
+            else:
                 response = await client.get(f"{base_url}/tags", timeout=2.0)
                 if response.status_code != 200:
                     console.print(f"[yellow]Warning: Could not connect to Ollama at {base_url}[/yellow]")
@@ -36,38 +418,35 @@ async def check_model_selection():
                 
                 models_data = response.json()
                 models = [m["name"] for m in models_data.get("models", [])]
+                if models:
+                    _model_list_cache = (time.monotonic(), models)
+            
+            if not models:
+                console.print("[red]No models found in Ollama![/red]")
+                console.print("Please pull a model, e.g.: [bold]ollama pull gemma3[/bold]")
+                sys.exit(1)
+            
+            # Check if default model exists
+            if default_model not in models and f"{default_model}:latest" not in models:
+                console.print(f"[yellow]Default model '{default_model}' not found in Ollama.[/yellow]")
+                console.print("\n[bold]Available Models:[/bold]")
+                for i, m in enumerate(models, 1):
+                    console.print(f"  {i}. {m}")
                 
-                if not models:
-                    console.print("[red]No models found in Ollama![/red]")
-                    console.print("Please pull a model, e.g.: [bold]ollama pull gemma3[/bold]")
-                    sys.exit(1)
+                console.print()
+                selected_model = models[await _ask_index("Select a model to use", len(models))]
                 
-                # Check if default model exists
-                if default_model not in models and f"{default_model}:latest" not in models:
-                    console.print(f"[yellow]Default model '{default_model}' not found in Ollama.[/yellow]")
-                    console.print("\n[bold]Available Models:[/bold]")
-                    for i, m in enumerate(models, 1):
-                        console.print(f"  {i}. {m}")
-                    
-                    console.print()
-                    choice = Prompt.ask(
-                        "Select a model to use",
-                        choices=[str(i) for i in range(1, len(models) + 1)],
-                        default="1"
-                    )
-                    selected_model = models[int(choice) - 1]
-                    
-                    # Update settings (in memory for this session)
-                    settings.ollama_default_model = selected_model
-                    console.print(f"[green]Using model: {selected_model}[/green]\n")
-                else:
-                    # Model exists, all good
-                    pass
-                    
-            except httpx.ConnectError:
-                console.print(f"[yellow]Warning: Could not connect to Ollama at {base_url}[/yellow]")
-                console.print(f"Using configured default: [bold]{default_model}[/bold]")
+                # Update settings (in memory for this session)
+                settings.ollama_default_model = selected_model
+                console.print(f"[green]Using model: {selected_model}[/green]\n")
+            else:
+                # Model exists, all good
+                pass
                 
+        except httpx.ConnectError:
+            console.print(f"[yellow]Warning: Could not connect to Ollama at {base_url}[/yellow]")
+            console.print(f"Using configured default: [bold]{default_model}[/bold]")
+            
     except Exception as e:
         console.print(f"[dim]Model check failed: {e}[/dim]")
 
@@ -99,13 +478,49 @@ def cli():
 @click.option("--seed", type=int, default=None, help="Random seed for reproducibility")
 @click.option("--tick-delay", "-d", type=float, default=None, help="Delay between steps (seconds)")
 @click.option("--simple", is_flag=True, help="Use simple log output instead of rich UI")
-def run(scenario: str | None, max_steps: int | None, seed: int | None, tick_delay: float | None, simple: bool):
+@click.option(
+    "--no-model-check",
+    is_flag=True,
+    envvar="EMOTIONSIM_SKIP_MODEL_CHECK",
+    help="Skip checking the configured model against Ollama (env: EMOTIONSIM_SKIP_MODEL_CHECK)",
+)
+def run(
+    scenario: str | None,
+    max_steps: int | None,
+    seed: int | None,
+    tick_delay: float | None,
+    simple: bool,
+    no_model_check: bool,
+):
     """Run a simulation in standalone mode (no server required).
     
     Example:
         emotionsim run --scenario "Rising Flood" --max-steps 50 --seed 42
     """
-    asyncio.run(_run_standalone(scenario, max_steps, seed, tick_delay, simple))
+    _run_command(_run_standalone(scenario, max_steps, seed, tick_delay, simple, check_model=not no_model_check))
+
+
+def _is_uuid(value: str) -> bool:
+    """Whether value parses as a UUID"""
+    try:
+        UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
+async def _resolve_scenario(db: AsyncSession, name_or_id: str) -> Scenario | None:
+    """Find a DB scenario by id, exact name or partial name, in that order of preference"""
+    if _is_uuid(name_or_id):
+        return await db.get(Scenario, name_or_id)
+    # One round trip: exact matches sort ahead of partial ones
+    result = await db.execute(
+        select(Scenario)
+        .where(Scenario.name.ilike(f"%{name_or_id}%"))
+        .order_by(case((Scenario.name == name_or_id, 0), else_=1), Scenario.name)
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
 
 
 async def _run_standalone(
@@ -114,81 +529,64 @@ async def _run_standalone(
     seed: int | None,
     tick_delay: float | None,
     simple: bool,
+    check_model: bool = True,
 ):
     """Run simulation in standalone mode"""
-    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-    from sqlalchemy import select
-    
-    from app.core.config import get_settings
-    from app.core.database import Base
-    from app.models.scenario import Scenario
-    from app.models.run import Run, RunStatus
-    from app.simulation.engine import SimulationEngine
-
-    
-    settings = get_settings()
     
     console.print("\n[bold cyan]EmotionSim[/bold cyan] - Standalone Mode\n")
     
-    # Check model
-    await check_model_selection()
-    
-    # Create database engine
-    engine = create_async_engine(settings.database_url, echo=False)
-    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    
-    # Initialize database
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Check model while the schema is prepared; the two don't depend on each other
+    schema = asyncio.create_task(_ensure_schema())
+    if check_model:
+        await check_model_selection()
+    await schema
     
-    async with async_session() as db:
+    async with _db_session() as db:
         
         # If no scenario specified, show menu
         if not scenario_name:
-            from app.scenarios.defaults import DEFAULT_SCENARIOS
-            from app.scenarios.storage import load_generated_scenarios
-            
-            # Fetch DB scenarios
-            db_scenarios = (await db.execute(select(Scenario))).scalars().all()
+            # Fetch DB scenarios (only what the menu shows; the pick is loaded below)
+            db_scenarios = (await db.execute(_SCENARIO_MENU_STMT)).all()
             
             # Load generated scenarios
-            generated_scenarios = load_generated_scenarios()
-            
-            console.print("\n[bold]Select a Scenario:[/bold]")
+            generated_scenarios = _generated_scenarios()
             
             choices = []
             choice_sources = []  # Track where each choice comes from
             
+            # One table printed once, instead of a console write per scenario
+            table = Table(title="Select a Scenario", title_justify="left", box=box.SIMPLE)
+            table.add_column("#", style="cyan", justify="right")
+            table.add_column("Source", style="magenta")
+            table.add_column("Name")
+            table.add_column("Agents", style="dim", justify="right")
+            
             # Add DB scenarios
-            if db_scenarios:
-                console.print("\n[dim]Saved Scenarios:[/dim]")
-                for idx, sc in enumerate(db_scenarios):
-                    choices.append(sc.name)
-                    choice_sources.append(("db", sc))
-                    console.print(f"  [cyan]{len(choices)}.[/cyan] {sc.name} [dim]({len(sc.agent_templates)} agents)[/dim]")
+            for sc in db_scenarios:
+                choices.append(sc.name)
+                choice_sources.append(("db", sc))
+                table.add_row(str(len(choices)), "Saved", sc.name, str(sc.agents))
             
             # Add Generated scenarios
-            if generated_scenarios:
-                console.print("\n[dim]Generated Scenarios:[/dim]")
-                for gen_sc in generated_scenarios:
-                    choices.append(gen_sc["name"])
-                    choice_sources.append(("generated", gen_sc))
-                    console.print(f"  [cyan]{len(choices)}.[/cyan] {gen_sc['name']} [dim]({gen_sc['agent_count']} agents)[/dim]")
+            for gen_sc in generated_scenarios:
+                choices.append(gen_sc["name"])
+                choice_sources.append(("generated", gen_sc))
+                table.add_row(str(len(choices)), "Generated", gen_sc["name"], str(gen_sc["agent_count"]))
             
             # Add Built-in scenarios
-            console.print("\n[dim]Built-in Templates:[/dim]")
             for name in DEFAULT_SCENARIOS.keys():
                 choices.append(name)
                 choice_sources.append(("builtin", name))
-                console.print(f"  [cyan]{len(choices)}.[/cyan] {name}")
-                
+                table.add_row(str(len(choices)), "Built-in", name, "")
+            
             console.print()
+            console.print(table)
             
             if not choices:
                 console.print("[red]No scenarios found![/red]")
                 return
 
-            choice_idx = Prompt.ask("Enter number", default="1")
+            choice_idx = await _ask(Prompt, "Enter number", default="1")
             try:
                 idx = int(choice_idx) - 1
                 if 0 <= idx < len(choices):
@@ -207,128 +605,67 @@ async def _run_standalone(
         # Find or create scenario
         scenario = None
         
+        if selected_source == "db":
+            # Picked from the menu; load the full row by id
+            scenario = await db.get(Scenario, selected_data.id)
         # Check if scenario_name is a simple numeric ID
-        if scenario_name.isdigit():
-            # Build scenario map
-            db_scenarios_list = (await db.execute(select(Scenario).order_by(Scenario.name))).scalars().all()
-            from app.scenarios.storage import load_generated_scenarios
-            generated_scenarios = load_generated_scenarios()
+        elif scenario_name.isdigit():
+            # Build scenario map (ids only, in the order `scenarios` lists them)
+            db_scenario_ids = (await db.execute(select(Scenario.id).order_by(Scenario.name))).scalars().all()
+            generated_scenarios = _generated_scenarios()
             
             idx = int(scenario_name)
             
             # Check if it's a DB scenario
-            if idx < len(db_scenarios_list):
-                scenario = db_scenarios_list[idx]
+            if idx < len(db_scenario_ids):
+                scenario = await db.get(Scenario, db_scenario_ids[idx])
             # Check if it's a generated scenario
-            elif idx < len(db_scenarios_list) + len(generated_scenarios):
-                gen_idx = idx - len(db_scenarios_list)
+            elif idx < len(db_scenario_ids) + len(generated_scenarios):
+                gen_idx = idx - len(db_scenario_ids)
                 gen_scenario = generated_scenarios[gen_idx]
                 console.print(f"[yellow]Loading generated scenario: {gen_scenario['name']}[/yellow]")
-                scenario = Scenario(
-                    name=gen_scenario["name"],
-                    description=gen_scenario["description"],
-                    config=gen_scenario["config"],
-                    agent_templates=gen_scenario["agent_templates"],
-                )
+                scenario = _new_generated_scenario(gen_scenario)
                 db.add(scenario)
                 await db.commit()
-                await db.refresh(scenario)
         else:
-            # Try UUID lookup
-            try:
-                from uuid import UUID
-                UUID(scenario_name)
-                result = await db.execute(
-                    select(Scenario).where(Scenario.id == scenario_name)
-                )
-                scenario = result.scalar_one_or_none()
-            except (ValueError, AttributeError):
-                # Try by name
-                result = await db.execute(
-                    select(Scenario).where(Scenario.name.ilike(f"%{scenario_name}%"))
-                )
-                scenario = result.scalar_one_or_none()
+            scenario = await _resolve_scenario(db, scenario_name)
+            
+            # Try generated scenario filename
+            if not scenario and not _is_uuid(scenario_name):
+                gen_scenario = _find_generated_scenario(scenario_name)
                 
-                # Try generated scenario filename
-                if not scenario:
-                    from app.scenarios.storage import load_generated_scenarios
-                    generated_scenarios = load_generated_scenarios()
-                    gen_scenario = next(
-                        (s for s in generated_scenarios if scenario_name in s["filename"] or scenario_name.lower() in s["name"].lower()),
-                        None
-                    )
-                    
-                    if gen_scenario:
-                        console.print(f"[yellow]Loading generated scenario: {gen_scenario['name']}[/yellow]")
-                        scenario = Scenario(
-                            name=gen_scenario["name"],
-                            description=gen_scenario["description"],
-                            config=gen_scenario["config"],
-                            agent_templates=gen_scenario["agent_templates"],
-                        )
-                        db.add(scenario)
-                        await db.commit()
-                        await db.refresh(scenario)
+                if gen_scenario:
+                    console.print(f"[yellow]Loading generated scenario: {gen_scenario['name']}[/yellow]")
+                    scenario = _new_generated_scenario(gen_scenario)
+                    db.add(scenario)
+                    await db.commit()
         
         if not scenario:
             # Check if it's a generated scenario
             if selected_source == "generated":
                 # Load from JSON file
                 console.print(f"[yellow]Loading generated scenario: {selected_data['name']}[/yellow]")
-                scenario = Scenario(
-                    name=selected_data["name"],
-                    description=selected_data["description"],
-                    config=selected_data["config"],
-                    agent_templates=selected_data["agent_templates"],
-                )
+                scenario = _new_generated_scenario(selected_data)
                 db.add(scenario)
                 await db.commit()
-                await db.refresh(scenario)
             else:
                 # Try to create a built-in scenario
-                from app.scenarios.defaults import DEFAULT_SCENARIOS
-                from app.scenarios.storage import load_generated_scenarios
-                
-                creator = next(
-                    (
-                        func
-                        for name, func in DEFAULT_SCENARIOS.items()
-                        if scenario_name.lower() in name.lower()
-                    ),
-                    None,
-                )
+                preset_name = _find_default_scenario(scenario_name)
                 
-                if creator:
-                    scenario_create = creator()
-                    console.print(f"[yellow]Creating built-in scenario: {scenario_create.name}[/yellow]")
-                    scenario = Scenario(
-                        name=scenario_create.name,
-                        description=scenario_create.description,
-                        config=scenario_create.config.model_dump(),
-                        agent_templates=[t.model_dump() for t in scenario_create.agent_templates],
-                    )
+                if preset_name:
+                    scenario = _new_preset_scenario(preset_name)
+                    console.print(f"[yellow]Creating built-in scenario: {scenario.name}[/yellow]")
                     db.add(scenario)
                     await db.commit()
-                    await db.refresh(scenario)
                 else:
                     # Try to find in generated scenarios
-                    generated_scenarios = load_generated_scenarios()
-                    gen_scenario = next(
-                        (s for s in generated_scenarios if scenario_name.lower() in s["name"].lower()),
-                        None
-                    )
+                    gen_scenario = _find_generated_scenario(scenario_name)
                     
                     if gen_scenario:
                         console.print(f"[yellow]Loading generated scenario: {gen_scenario['name']}[/yellow]")
-                        scenario = Scenario(
-                            name=gen_scenario["name"],
-                            description=gen_scenario["description"],
-                            config=gen_scenario["config"],
-                            agent_templates=gen_scenario["agent_templates"],
-                        )
+                        scenario = _new_generated_scenario(gen_scenario)
                         db.add(scenario)
                         await db.commit()
-                        await db.refresh(scenario)
                     else:
                         console.print(f"[red]Scenario '{scenario_name}' not found.[/red]")
                         console.print("Use 'emotionsim scenarios --create-builtin' to see available scenarios.")
@@ -345,13 +682,12 @@ async def _run_standalone(
         )
         db.add(run_record)
         await db.commit()
-        await db.refresh(run_record)
         
         console.print(f"[green]✓[/green] Created run: [dim]{run_record.id}[/dim]")
         
         # Setup renderer
         if simple:
-            logger = SimpleEventLogger(console)
+            logger = SimpleEventLogger(console, fast=True)
             
             def on_event(event_type: str, data: dict[str, Any]):
                 logger.log_event(event_type, data)
@@ -373,7 +709,9 @@ async def _run_standalone(
                 # Note: We no longer add messages from step_completed to avoid duplicates
                 # and ensure real-time logging via the 'message' event above.
         
-        # Create engine
+        # Create engine (imported here: it pulls in the LLM clients, which the
+        # listing/status commands don't need)
+        from app.simulation.engine import SimulationEngine
         engine_sim = SimulationEngine(
             run_id=run_record.id,
             db_session=db,
@@ -399,18 +737,21 @@ async def _run_standalone(
         console.print()
         
         # Handle Ctrl+C gracefully
-        stop_requested = False
+        stop_requested = asyncio.Event()
         
-        def signal_handler(sig, frame):
-            nonlocal stop_requested
-            if stop_requested:
+        def request_stop():
+            if stop_requested.is_set():
                 console.print("\n[red]Force quit[/red]")
                 sys.exit(1)
-            stop_requested = True
+            stop_requested.set()
             console.print("\n[yellow]Stopping simulation... (Ctrl+C again to force)[/yellow]")
-            asyncio.create_task(engine_sim.stop())
+            asyncio.ensure_future(engine_sim.stop())
         
-        signal.signal(signal.SIGINT, signal_handler)
+        # The loop runs the handler in its own context; Windows lacks add_signal_handler
+        if sys.platform == "win32":
+            signal.signal(signal.SIGINT, lambda sig, frame: request_stop())
+        else:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGINT, request_stop)
         
         # Run with live display or simple output
         if simple:
@@ -429,20 +770,17 @@ async def _run_standalone(
                 logger.last_stream_agent = None
         else:
             console.print("[cyan]Starting simulation (press Ctrl+C to stop)...[/cyan]\n")
-            # Increase refresh rate for smooth streaming
-            with Live(renderer.render_layout(), console=console, refresh_per_second=15) as live:
+            # Redraws are driven by events and streamed tokens, not a refresh thread
+            with Live(renderer.render_layout(), console=console, auto_refresh=False) as live:
                 
                 async def stream_callback(agent_id: str, token: str):
                     renderer.update_stream(agent_id, token)
-                    live.refresh()
                 
                 # Start simulation in background
                 task = asyncio.create_task(engine_sim.start(stream_callback=stream_callback))
                 
                 # Update display while running
-                while not task.done() and not stop_requested:
-                    live.update(renderer.render_layout())
-                    await asyncio.sleep(0.25)
+                await _drive_live_display(live, renderer, task, stop_requested)
                 
                 # Wait for task to complete
                 try:
@@ -451,7 +789,7 @@ async def _run_standalone(
                     pass
                 
                 # Final update
-                live.update(renderer.render_layout())
+                live.update(renderer.render_layout(), refresh=True)
         
         console.print()
         console.print(f"[green]✓[/green] Simulation complete. Final step: {engine_sim.current_step}")
@@ -484,32 +822,111 @@ def monitor(url: str, run_id: str, simple: bool):
     Example:
         emotionsim monitor --run-id abc123
     """
-    asyncio.run(_monitor_websocket(url, run_id, simple))
+    _run_command(_monitor_websocket(url, run_id, simple))
+
+
+def _health_url_for(ws_url: str) -> str:
+    """Map a websocket URL to the HTTP health endpoint of the same server"""
+    parts = urlsplit(ws_url)
+    scheme = "https" if parts.scheme == "wss" else "http"
+    return f"{scheme}://{parts.netloc}/health"
+
+
+# Decoded monitor frames waiting for the renderer, and how many it applies per redraw
+_WS_EVENT_QUEUE_SIZE = 256
+_WS_EVENT_BATCH = 32
+
+
+async def _render_ws_events(ws, renderer: EventRenderer, live: Live) -> None:
+    """Feed websocket events to the live display until the run completes or the socket closes.
+
+    Frames are received and decoded by a reader task, so a slow redraw never stalls
+    recv (and with it ping replies); the display applies queued events in batches
+    and redraws once per batch.
+    """
+    queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(maxsize=_WS_EVENT_QUEUE_SIZE)
+    
+    async def read_frames() -> None:
+        try:
+            async for message in ws:
+                if _is_keepalive(message):
+                    continue
+                try:
+                    await queue.put(orjson.loads(message))
+                # orjson's decode errors subclass json.JSONDecodeError
+                except json.JSONDecodeError:
+                    pass
+        except Exception:
+            # Wake the display; the error is re-raised when the reader is awaited
+            await queue.put(None)
+            raise
+        # End of stream
+        await queue.put(None)
+    
+    reader = asyncio.create_task(read_frames())
+    try:
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < _WS_EVENT_BATCH and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            finished = completed = False
+            for data in batch:
+                if data is None:
+                    finished = True
+                    break
+                event_type = data.get("event", "unknown")
+                event_data = data.get("data", {})
+                
+                renderer.add_event(event_type, event_data)
+                
+                # Add messages
+                if event_type == "step_completed":
+                    for msg in event_data.get("messages", []):
+                        renderer.add_message(msg)
+                
+                # Exit on completion
+                if event_type in ("run_completed", "run_stopped"):
+                    finished = completed = True
+                    break
+            
+            live.update(renderer.render_layout())
+            if finished:
+                break
+        
+        if completed:
+            await asyncio.sleep(1)  # Show final state briefly
+    finally:
+        reader.cancel()
+        try:
+            await reader
+        except asyncio.CancelledError:
+            pass
 
 
 async def _monitor_websocket(base_url: str, run_id: str, simple: bool):
     """Connect to WebSocket and monitor events"""
-    import websockets
-    
     ws_url = f"{base_url}/{run_id}"
     
     console.print(f"\n[bold cyan]EmotionSim Monitor[/bold cyan] - Client Mode")
     console.print(f"Connecting to: [dim]{ws_url}[/dim]\n")
     
     if simple:
-        logger = SimpleEventLogger(console)
+        logger = SimpleEventLogger(console, fast=True)
     else:
         renderer = EventRenderer(console)
     
     try:
-        async with websockets.connect(ws_url) as ws:
+        async with websockets.connect(ws_url, **_WS_CONNECT_OPTIONS) as ws:
             console.print("[green]✓[/green] Connected to simulation\n")
             
             if simple:
                 # Simple streaming mode
                 async for message in ws:
+                    if _is_keepalive(message):
+                        continue
                     try:
-                        data = json.loads(message)
+                        data = orjson.loads(message)
                         event_type = data.get("event", "unknown")
                         event_data = data.get("data", {})
                         
@@ -529,38 +946,15 @@ async def _monitor_websocket(base_url: str, run_id: str, simple: bool):
             else:
                 # Rich live display mode
                 with Live(renderer.render_layout(), console=console, refresh_per_second=4) as live:
-                    async for message in ws:
-                        try:
-                            data = json.loads(message)
-                            event_type = data.get("event", "unknown")
-                            event_data = data.get("data", {})
-                            
-                            renderer.add_event(event_type, event_data)
-                            
-                            # Add messages
-                            if event_type == "step_completed":
-                                for msg in event_data.get("messages", []):
-                                    renderer.add_message(msg)
-                            
-                            live.update(renderer.render_layout())
-                            
-                            # Exit on completion
-                            if event_type in ("run_completed", "run_stopped"):
-                                await asyncio.sleep(1)  # Show final state briefly
-                                break
-                                
-                        except json.JSONDecodeError:
-                            pass
+                    await _render_ws_events(ws, renderer, live)
             
             console.print("\n[green]✓[/green] Monitoring complete")
             
     except ConnectionRefusedError:
         console.print(f"[red]✗[/red] Could not connect to {ws_url}")
         
-        if Confirm.ask("Backend server not reachable. Start it now?"):
+        if await _ask(Confirm, "Backend server not reachable. Start it now?"):
             console.print("[yellow]Starting backend server...[/yellow]")
-            import subprocess
-            
             # Start backend in background
             # We assume we are in backend dir because cli runs from there?
             # Actually CLI might be run as `python -m app.cli` from backend dir.
@@ -570,20 +964,23 @@ async def _monitor_websocket(base_url: str, run_id: str, simple: bool):
                 stderr=subprocess.DEVNULL,
             )
             
-            # Wait for it to start
+            # Wait for it to start, probing quickly at first and backing off to 1s
             connected = False
+            health_url = _health_url_for(base_url)
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + 15
+            delay = 0.05
             with console.status("[cyan]Waiting for server to start...[/cyan]"):
-                for _ in range(15):
-                    await asyncio.sleep(1)
+                while loop.time() < deadline:
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, 1.0)
                     try:
-                        import httpx
-                        async with httpx.AsyncClient() as client:
-                             # Check health endpoint instead of WS for startup
-                             resp = await client.get(f"{base_url}/health", timeout=1.0)
-                             if resp.status_code == 200:
-                                 connected = True
-                                 break
-                    except:
+                        # Check health endpoint instead of WS for startup; HEAD skips the body
+                        resp = await _get_http_client().head(health_url, timeout=1.0)
+                        if resp.is_success:
+                            connected = True
+                            break
+                    except httpx.TransportError:
                         pass
             
             if connected:
@@ -612,71 +1009,60 @@ def scenarios(create_builtin: bool):
         emotionsim scenarios
         emotionsim scenarios --create-builtin
     """
-    asyncio.run(_list_scenarios(create_builtin))
+    _run_command(_list_scenarios(create_builtin))
 
 
 async def _list_scenarios(create_builtin: bool):
     """List scenarios from database"""
-    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-    from sqlalchemy import select
-    
-    from app.core.config import get_settings
-    from app.core.database import Base
-    from app.models.scenario import Scenario
-    from app.scenarios.defaults import DEFAULT_SCENARIOS
-    
-    settings = get_settings()
-    engine = create_async_engine(settings.database_url, echo=False)
-    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    
-    async with async_session() as db:
+    async with _db_session() as db:
         if create_builtin:
             console.print("[cyan]Creating built-in scenarios...[/cyan]")
-            for name, creator in DEFAULT_SCENARIOS.items():
-                result = await db.execute(select(Scenario).where(Scenario.name == name))
-                if not result.scalar_one_or_none():
-                    scenario_create = creator()
-                    scenario = Scenario(
-                        name=scenario_create.name,
-                        description=scenario_create.description,
-                        config=scenario_create.config.model_dump(),
-                        agent_templates=[t.model_dump() for t in scenario_create.agent_templates],
-                    )
-                    db.add(scenario)
-                    await db.commit()
-                    console.print(f"  [green]✓[/green] Created: {name}")
-                else:
+            result = await db.execute(
+                select(Scenario.name).where(Scenario.name.in_(DEFAULT_SCENARIOS))
+            )
+            existing = set(result.scalars())
+            db.add_all(_new_preset_scenario(name) for name in DEFAULT_SCENARIOS if name not in existing)
+            await db.commit()
+            for name in DEFAULT_SCENARIOS:
+                if name in existing:
                     console.print(f"  [dim]Already exists: {name}[/dim]")
+                else:
+                    console.print(f"  [green]✓[/green] Created: {name}")
             console.print()
         
-        # List scenarios from DB
-        result = await db.execute(select(Scenario).order_by(Scenario.name))
-        db_scenarios = result.scalars().all()
+        # List scenarios from DB, projecting only the listed columns so the
+        # agent_templates/config JSON is summarized in SQL instead of decoded here
+        result = await db.execute(
+            select(
+                Scenario.id,
+                Scenario.name,
+                Scenario.description,
+                func.coalesce(func.json_array_length(Scenario.agent_templates), 0).label("agents"),
+                Scenario.config["max_steps"].as_integer().label("max_steps"),
+            ).order_by(Scenario.name)
+        )
+        db_scenarios = result.all()
         
         # Load generated scenarios
-        from app.scenarios.storage import load_generated_scenarios
-        generated_scenarios = load_generated_scenarios()
+        generated_scenarios = _generated_scenarios()
         
         # Combine all scenarios
         all_scenarios = []
         scenario_map = {}  # Map simple ID to actual scenario data
         
         # Add DB scenarios
-        for idx, s in enumerate(db_scenarios):
+        for idx, row in enumerate(db_scenarios):
             simple_id = str(idx)
             all_scenarios.append({
                 "source": "DB",
-                "name": s.name,
+                "name": row.name,
                 "id": simple_id,
-                "db_id": str(s.id),
-                "agents": len(s.agent_templates) if s.agent_templates else 0,
-                "max_steps": s.config.get("max_steps", "?") if s.config else "?",
-                "description": s.description or "",
+                "db_id": str(row.id),
+                "agents": row.agents,
+                "max_steps": "?" if row.max_steps is None else row.max_steps,
+                "description": row.description or "",
             })
-            scenario_map[simple_id] = {"type": "db", "db_id": str(s.id), "name": s.name}
+            scenario_map[simple_id] = {"type": "db", "db_id": str(row.id), "name": row.name}
         
         # Add generated scenarios
         start_idx = len(db_scenarios)
@@ -739,133 +1125,121 @@ def interactive():
     Example:
         emotionsim interactive
     """
-    asyncio.run(_interactive_wizard())
+    _run_command(_interactive_wizard())
 
 
 async def _interactive_wizard():
     """Interactive simulation launcher"""
-    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-    from sqlalchemy import select
-    
-    from app.core.config import get_settings
-    from app.core.database import Base
-    from app.models.scenario import Scenario
-    from app.scenarios.defaults import DEFAULT_SCENARIOS
-    
     console.print()
     console.print("[bold cyan]╔══════════════════════════════════════╗[/bold cyan]")
     console.print("[bold cyan]║     EmotionSim Interactive Mode      ║[/bold cyan]")
     console.print("[bold cyan]╚══════════════════════════════════════╝[/bold cyan]")
     console.print()
     
-    settings = get_settings()
-    engine = create_async_engine(settings.database_url, echo=False)
-    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Check model while the schema is prepared and the generated scenario files
+    # are read (in a thread); none of them depend on each other
+    schema = asyncio.create_task(_ensure_schema())
+    generated = asyncio.create_task(asyncio.to_thread(_generated_scenarios))
+    await check_model_selection()
+    await schema
     
-    async with async_session() as db:
-        # Check model
-        await check_model_selection()
-        
-        # Get DB scenarios
-        result = await db.execute(select(Scenario).order_by(Scenario.name))
-        db_scenarios = list(result.scalars().all())
+    async with _db_session() as db:
+        # Get DB scenarios as (id, name, agent count); the pick is loaded below
+        result = await db.execute(_SCENARIO_MENU_STMT.order_by(Scenario.name))
+        db_scenarios = list(result.tuples().all())
         
         # Load generated scenarios
-        from app.scenarios.storage import load_generated_scenarios
-        generated_scenarios = load_generated_scenarios()
+        generated_scenarios = await generated
         
         # Create built-in if none exist
         if not db_scenarios and not generated_scenarios:
             console.print("[yellow]No scenarios found. Creating built-in scenarios...[/yellow]")
-            for name, creator in DEFAULT_SCENARIOS.items():
-                scenario_create = creator()
-                scenario = Scenario(
-                    name=scenario_create.name,
-                    description=scenario_create.description,
-                    config=scenario_create.config.model_dump(),
-                    agent_templates=[t.model_dump() for t in scenario_create.agent_templates],
-                )
+            new_scenarios = []
+            for name in DEFAULT_SCENARIOS:
+                scenario = _new_preset_scenario(name)
                 db.add(scenario)
+                new_scenarios.append(scenario)
             await db.commit()
             
-            result = await db.execute(select(Scenario).order_by(Scenario.name))
-            db_scenarios = list(result.scalars().all())
+            # Sessions don't expire on commit, so the new rows are already complete
+            # (and db.get() below finds them in the identity map)
+            db_scenarios = sorted(
+                ((s.id, s.name, len(s.agent_templates)) for s in new_scenarios),
+                key=lambda entry: entry[1],
+            )
             console.print(f"[green]✓[/green] Created {len(db_scenarios)} scenarios.\n")
         
         # Combine all scenarios for selection
         all_scenarios = []
         scenario_sources = []
         
+        # The menu is collected into one Group and printed once; names are plain
+        # Text, so scenario names aren't parsed as markup
+        menu: list[Text] = [Text("Available Scenarios:", style="bold")]
+
+        def add_entry(name: str, agent_count: int) -> None:
+            menu.append(Text.assemble(
+                ("  ", ""), (f"{len(all_scenarios)}.", "cyan"), f" {name} ", (f"({agent_count} agents)", "dim"),
+            ))
+
         # Add DB scenarios
-        console.print("[bold]Available Scenarios:[/bold]")
         if db_scenarios:
-            console.print("\n[dim]Saved Scenarios:[/dim]")
-            for s in db_scenarios:
-                agent_count = len(s.agent_templates) if s.agent_templates else 0
-                all_scenarios.append(s)
-                scenario_sources.append(("db", s))
-                console.print(f"  [cyan]{len(all_scenarios)}.[/cyan] {s.name} [dim]({agent_count} agents)[/dim]")
+            menu.append(Text("\nSaved Scenarios:", style="dim"))
+            for scenario_id, name, agent_count in db_scenarios:
+                all_scenarios.append(name)
+                scenario_sources.append(("db", scenario_id))
+                add_entry(name, agent_count)
         
         # Add generated scenarios
         if generated_scenarios:
-            console.print("\n[dim]Generated Scenarios:[/dim]")
+            menu.append(Text("\nGenerated Scenarios:", style="dim"))
             for g in generated_scenarios:
                 all_scenarios.append(g)
                 scenario_sources.append(("generated", g))
-                console.print(f"  [cyan]{len(all_scenarios)}.[/cyan] {g['name']} [dim]({g['agent_count']} agents)[/dim]")
+                add_entry(g["name"], g["agent_count"])
         
-        console.print()
+        menu.append(Text())
+        console.print(Group(*menu))
         
         # Select scenario
-        choice = Prompt.ask(
-            "Select scenario",
-            choices=[str(i) for i in range(1, len(all_scenarios) + 1)],
-            default="1"
-        )
-        choice_idx = int(choice) - 1
+        choice_idx = await _ask_index("Select scenario", len(all_scenarios))
         source_type, selected_data = scenario_sources[choice_idx]
         
         # Load scenario into DB if it's a generated one
         if source_type == "generated":
-            selected = Scenario(
-                name=selected_data["name"],
-                description=selected_data["description"],
-                config=selected_data["config"],
-                agent_templates=selected_data["agent_templates"],
-            )
+            selected = _new_generated_scenario(selected_data)
             db.add(selected)
             await db.commit()
-            await db.refresh(selected)
         else:
-            selected = selected_data
+            selected = await db.get(Scenario, selected_data)
         
         console.print()
         
         # Configuration
         default_steps = selected.config.get("max_steps", 10)
-        max_steps_str = Prompt.ask(
+        max_steps_str = await _ask(
+            Prompt,
             "Max steps",
             default=str(default_steps)
         )
         max_steps = int(max_steps_str)
         
         default_delay = selected.config.get("tick_delay", 1.0)
-        tick_delay_str = Prompt.ask(
+        tick_delay_str = await _ask(
+            Prompt,
             "Tick delay (seconds)",
             default=str(default_delay)
         )
         tick_delay = float(tick_delay_str)
         
-        seed_str = Prompt.ask(
+        seed_str = await _ask(
+            Prompt,
             "Random seed (blank for random)",
             default=""
         )
         seed = int(seed_str) if seed_str else None
         
-        use_rich = Confirm.ask("Use rich UI display?", default=True)
+        use_rich = await _ask(Confirm, "Use rich UI display?", default=True)
         
         console.print()
         console.print("[bold]Configuration:[/bold]")
@@ -876,7 +1250,7 @@ async def _interactive_wizard():
         console.print(f"  Display: [yellow]{'Rich UI' if use_rich else 'Simple logs'}[/yellow]")
         console.print()
         
-        if not Confirm.ask("Start simulation?", default=True):
+        if not await _ask(Confirm, "Start simulation?", default=True):
             console.print("[dim]Cancelled.[/dim]")
             return
         
@@ -904,49 +1278,59 @@ def status(url: str):
     Example:
         emotionsim status
     """
-    asyncio.run(_check_status(url))
+    _run_command(_check_status(url))
 
 
 async def _check_status(base_url: str):
     """Check server status"""
-    import httpx
-    
     console.print(f"\n[bold cyan]EmotionSim[/bold cyan] - Status Check")
     console.print(f"Server: [dim]{base_url}[/dim]\n")
     
     try:
-        async with httpx.AsyncClient() as client:
-            # Health check
-            response = await client.get(f"{base_url}/health", timeout=5.0)
-            if response.status_code == 200:
-                data = response.json()
-                console.print(f"[green]✓[/green] Server is [green]healthy[/green]")
-                console.print(f"  App: {data.get('app', 'unknown')}")
+        # Both requests are independent, so issue them together
+        client = _get_http_client()
+        health_response, runs_response = await asyncio.gather(
+            client.get(f"{base_url}/health"),  # GET: the body carries the app name
+            # Only the five most recent runs are shown; let the server do the slicing
+            client.get(f"{base_url}/api/runs/", params={"limit": 5}),
+            return_exceptions=True,
+        )
+        
+        # Health check
+        if isinstance(health_response, Exception):
+            raise health_response
+        response = health_response
+        if response.status_code == 200:
+            data = response.json()
+            console.print(f"[green]✓[/green] Server is [green]healthy[/green]")
+            console.print(f"  App: {data.get('app', 'unknown')}")
+        else:
+            console.print(f"[red]✗[/red] Server returned status {response.status_code}")
+            return
+        
+        # Get runs
+        if isinstance(runs_response, Exception):
+            raise runs_response
+        response = runs_response
+        if response.status_code == 200:
+            runs = response.json()
+            console.print(f"\n[bold]Recent Runs:[/bold]")
+            if not runs:
+                console.print("  [dim]No runs found[/dim]")
             else:
-                console.print(f"[red]✗[/red] Server returned status {response.status_code}")
-                return
-            
-            # Get runs
-            response = await client.get(f"{base_url}/api/runs/", timeout=5.0)
-            if response.status_code == 200:
-                runs = response.json()
-                console.print(f"\n[bold]Recent Runs:[/bold]")
-                if not runs:
-                    console.print("  [dim]No runs found[/dim]")
-                else:
-                    table = Table(box=box.SIMPLE)
-                    table.add_column("ID", style="dim")
-                    table.add_column("Status", style="cyan")
-                    table.add_column("Steps", style="yellow")
-                    
-                    for run in runs[:5]:
-                        table.add_row(
-                            str(run.get("id", "?"))[:8] + "...",
-                            run.get("status", "?"),
-                            str(run.get("current_step", 0)),
-                        )
-                    console.print(table)
-                    
+                table = Table(box=box.SIMPLE)
+                table.add_column("ID", style="dim")
+                table.add_column("Status", style="cyan")
+                table.add_column("Steps", style="yellow")
+                
+                for run in runs[:5]:
+                    table.add_row(
+                        str(run.get("id", "?"))[:8] + "...",
+                        run.get("status", "?"),
+                        str(run.get("current_step", 0)),
+                    )
+                console.print(table)
+                
     except httpx.ConnectError:
         console.print(f"[red]✗[/red] Could not connect to {base_url}")
         console.print("  Make sure the backend server is running:")
@@ -967,62 +1351,40 @@ def best(limit: int):
     Example:
         emotionsim best
     """
-    asyncio.run(_show_best_runs(limit))
+    _run_command(_show_best_runs(limit))
 
 
 async def _show_best_runs(limit: int):
     """Show best runs analysis"""
-    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-    from sqlalchemy import select, desc
-    from sqlalchemy.orm import selectinload
-    
-    from app.core.config import get_settings
-    from app.core.database import Base
-    from app.models.run import Run, RunStatus
-    
-    settings = get_settings()
-    engine = create_async_engine(settings.database_url, echo=False)
-    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    
     console.print(f"\n[bold cyan]EmotionSim[/bold cyan] - Best Simulations")
     
-    async with async_session() as db:
-        # Get completed runs logic
-        # Since JSON metrics querying depends on DB type (SQLite vs PG), we'll fetch completed runs 
-        # and sort in Python for simplicity and compatibility
+    async with _db_session() as db:
+        # Rank in SQL so only the top `limit` runs leave the database. The JSON
+        # accessors compile to json_extract on SQLite and ->> on PostgreSQL.
+        # Simple score: Health - Stress (higher is better); missing metrics count
+        # as the worst case (no health, full stress)
+        health = func.coalesce(Run.metrics["avg_health"].as_float(), 0.0)
+        stress = func.coalesce(Run.metrics["avg_stress"].as_float(), 10.0)
+        score = (health - stress).label("score")
         result = await db.execute(
-            select(Run)
+            select(
+                Run.id,
+                Run.current_step,
+                Scenario.name.label("scenario_name"),
+                health.label("health"),
+                stress.label("stress"),
+                score,
+            )
+            .outerjoin(Scenario, Scenario.id == Run.scenario_id)
             .where(Run.status == RunStatus.COMPLETED)
-            .order_by(desc(Run.completed_at))
-            .options(selectinload(Run.scenario))
+            .order_by(desc(score), desc(Run.completed_at))
+            .limit(limit)
         )
-        runs = result.scalars().all()
+        top_runs = result.all()
         
-        if not runs:
+        if not top_runs:
             console.print("[yellow]No completed runs found.[/yellow]")
             return
-            
-        # Calculate scores and sort
-        scored_runs = []
-        for run in runs:
-            metrics = run.metrics or {}
-            avg_health = float(metrics.get("avg_health", 0))
-            avg_stress = float(metrics.get("avg_stress", 10))
-            
-            # Simple score: Health - Stress (higher is better)
-            # Normalize stress (lower is better, so negate)
-            score = avg_health - avg_stress
-            
-            scored_runs.append({
-                "run": run,
-                "score": score,
-                "health": avg_health,
-                "stress": avg_stress,
-                "steps": run.current_step
-            })
-            
-        # Sort by score descending
-        scored_runs.sort(key=lambda x: x["score"], reverse=True)
         
         # Display
         table = Table(title=f"Top {limit} Simulations", box=box.ROUNDED)
@@ -1034,16 +1396,15 @@ async def _show_best_runs(limit: int):
         table.add_column("Avg Stress", style="red")
         table.add_column("Steps", style="yellow")
         
-        for i, item in enumerate(scored_runs[:limit], 1):
-            run = item["run"]
+        for i, row in enumerate(top_runs, 1):
             table.add_row(
                 str(i),
-                str(run.id)[:8] + "...",
-                run.scenario.name if run.scenario else "Unknown",
-                f"{item['score']:.2f}",
-                f"{item['health']:.1f}",
-                f"{item['stress']:.1f}",
-                str(item['steps'])
+                str(row.id)[:8] + "...",
+                row.scenario_name or "Unknown",
+                f"{row.score:.2f}",
+                f"{row.health:.1f}",
+                f"{row.stress:.1f}",
+                str(row.current_step)
             )
             
         console.print(table)
@@ -1061,21 +1422,11 @@ def auto(count: int | None):
     
     Checks for pending runs first, then generates new ones from presets.
     """
-    asyncio.run(_run_auto_loop(count))
+    _run_command(_run_auto_loop(count))
 
 
 async def _run_auto_loop(count: int | None):
     """Run simulations sequentially"""
-    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-    from sqlalchemy import select, asc
-    import random
-    
-    from app.core.config import get_settings
-    from app.core.database import Base
-    from app.models.scenario import Scenario
-    from app.models.run import Run, RunStatus
-    from app.scenarios.defaults import DEFAULT_SCENARIOS
-    
     settings = get_settings()
     
     console.print("\n[bold cyan]EmotionSim[/bold cyan] - Auto Runner")
@@ -1087,8 +1438,10 @@ async def _run_auto_loop(count: int | None):
     selected_preset = None
     
     # Get available presets
-    preset_choices = list(DEFAULT_SCENARIOS.keys())
-    preset_choices.sort()
+    preset_choices = sorted(_PRESET_NAMES)
+
+    # Prepare the schema while the user picks a source
+    schema = asyncio.create_task(_ensure_schema())
     
     console.print("[bold]Select Auto-Run Source:[/bold]")
     console.print("  [cyan]0.[/cyan] [bold white]Random (Cycle through all)[/bold white]")
@@ -1096,7 +1449,7 @@ async def _run_auto_loop(count: int | None):
         console.print(f"  [cyan]{i}.[/cyan] {name}")
     console.print()
     
-    choice_idx = Prompt.ask("Enter number", default="0")
+    choice_idx = await _ask(Prompt, "Enter number", default="0")
     try:
         idx = int(choice_idx)
         if idx > 0 and idx <= len(preset_choices):
@@ -1108,232 +1461,316 @@ async def _run_auto_loop(count: int | None):
         console.print("[yellow]Invalid input, using Random selection[/yellow]")
 
     console.print()
+    await schema
     
-    # Setup DB
-    engine = create_async_engine(settings.database_url, echo=False)
-    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    
-    # Ensure DB exists
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    
-    # CLEANUP: End all pending and running simulations before starting
-    async with async_session() as db:
-        cleanup_query = select(Run).where(Run.status.in_([RunStatus.PENDING, RunStatus.RUNNING]))
-        cleanup_result = await db.execute(cleanup_query)
-        runs_to_cleanup = cleanup_result.scalars().all()
+    # One session serves the whole loop; each cycle commits its own writes
+    async with _db_session() as db:
+        # CLEANUP: End all pending and running simulations before starting,
+        # in one UPDATE that only returns the ids it touched
+        cleanup_result = await db.execute(
+            update(Run)
+            .where(Run.status.in_([RunStatus.PENDING, RunStatus.RUNNING]))
+            .values(status=RunStatus.CANCELLED)
+            .returning(Run.id)
+        )
+        cancelled_ids = cleanup_result.scalars().all()
+        await db.commit()
         
-        if runs_to_cleanup:
-            console.print(f"[yellow]Cleaning up {len(runs_to_cleanup)} pending/running simulation(s)...[/yellow]")
-            for run in runs_to_cleanup:
-                run.status = RunStatus.CANCELLED
-                console.print(f"  [dim]Stopped run {str(run.id)[:8]}...[/dim]")
-            await db.commit()
+        if cancelled_ids:
+            console.print(f"[yellow]Cleaning up {len(cancelled_ids)} pending/running simulation(s)...[/yellow]")
+            for run_id in cancelled_ids:
+                console.print(f"  [dim]Stopped run {str(run_id)[:8]}...[/dim]")
             console.print("[green]✓[/green] Cleanup complete\n")
         
+        await _run_auto_cycles(db, count, selected_preset)
+
+
+async def _run_auto_cycles(db: AsyncSession, count: int | None, selected_preset: str | None) -> None:
+    """Execute count runs (forever if None), draining claimed pending runs before creating new ones"""
     runs_completed = 0
-    
-    while count is None or runs_completed < count:
-        console.print(f"[bold]>>> Starting cycle {runs_completed + 1}[/bold]")
-        
-        # Check for pending runs
-        target_run_id = None
-        scenario_name = None
-        
-        async with async_session() as db:
-            # Check for PENDING runs
-            result = await db.execute(
-                select(Run)
-                .where(Run.status == RunStatus.PENDING)
-                .order_by(asc(Run.created_at))
-                .limit(1)
-            )
-            pending_run = result.scalar_one_or_none()
-            
-            if pending_run:
-                target_run_id = pending_run.id
-                # Eager load scenario to get name
-                result = await db.execute(select(Scenario).where(Scenario.id == pending_run.scenario_id))
-                scenario = result.scalar_one_or_none()
-                scenario_name = scenario.name if scenario else "Unknown"
+    # (run_id, scenario_name) of claimed runs not yet executed
+    pending_queue: deque[tuple[str, str]] = deque()
+    # Claims started while the current run executes
+    prefetches: list[asyncio.Task] = []
+
+    def _schedule_prefetch() -> None:
+        """Claim the runs after the current one on a separate session"""
+        prefetches.append(
+            asyncio.create_task(_prefetch_pending_runs(_claim_limit(count, runs_completed + 1)))
+        )
+
+    try:
+        while count is None or runs_completed < count:
+            console.print(f"[bold]>>> Starting cycle {runs_completed + 1}[/bold]")
+
+            # Check for pending runs
+            target_run_id = None
+            scenario_name = None
+            had_pending = False
+
+            if not pending_queue:
+                # Claim a batch of PENDING runs for this process, no more than it will execute
+                pending_queue.extend(await _claim_pending_runs(db, _claim_limit(count, runs_completed)))
+
+            if pending_queue:
+                target_run_id, scenario_name = pending_queue.popleft()
+                had_pending = True
                 console.print(f"[yellow]Found pending run:[/yellow] {scenario_name} ({target_run_id[:8]}...)")
             else:
                 # Create a new run
-                preset_name = selected_preset or random.choice(list(DEFAULT_SCENARIOS.keys()))
+                preset_name = selected_preset or random.choice(_PRESET_NAMES)
                 console.print(f"[cyan]No pending runs. Creating new run:[/cyan] {preset_name}")
-                
-                # Check if scenario exists
-                result = await db.execute(select(Scenario).where(Scenario.name.ilike(f"%{preset_name}%")))
-                scenario = result.scalar_one_or_none()
-                
-                if not scenario:
-                    # Create it
-                    creator = DEFAULT_SCENARIOS[preset_name]
-                    scenario_create = creator()
-                    scenario = Scenario(
-                        name=scenario_create.name,
-                        description=scenario_create.description,
-                        config=scenario_create.config.model_dump(),
-                        agent_templates=[t.model_dump() for t in scenario_create.agent_templates],
+
+                try:
+                    target_run_id, scenario_name = await _create_preset_run(db, preset_name)
+                except Exception as e:
+                    console.print(f"[red]Error creating run for {preset_name}:[/red] {e}")
+                    await db.rollback()
+                    _PRESET_SCENARIO_CACHE.pop(preset_name, None)
+                    await asyncio.sleep(2)
+                    continue
+
+            if target_run_id:
+                # Run it using existing standalone runner
+                # We use simple mode for auto runner to keep logs clean
+                console.print(f"[green]Executing run {target_run_id} ({scenario_name})...[/green]")
+
+                # With the queue drained and another cycle to follow, claim the next batch once
+                # this run reaches its last step, so the next cycle can start without a poll
+                more_to_run = count is None or runs_completed + 1 < count
+                on_last_step = _schedule_prefetch if (not pending_queue and more_to_run) else None
+
+                try:
+                    # We need to run this function. 
+                    # Note: passing specific run_id isn't supported by _run_standalone directly
+                    # _run_standalone takes scenario name and creates a NEW run.
+                    # We need to refactor _run_standalone or create a variant that takes a run_id.
+                    # But wait, looking at _run_standalone, it creates a run.
+
+                    # Let's modify _run_standalone to accept an optional run_id!
+                    # Or simply implement the execution logic here reusing the engine?
+
+                    # Reusing internal logic is better to avoid "creating" a run when we already have one.
+
+                    # Reuse logic from _run_standalone but for an existing run
+                    await _execute_existing_run(
+                        db, target_run_id, simple=False, claimed=True, on_last_step=on_last_step
                     )
-                    db.add(scenario)
-                    await db.commit()
-                    await db.refresh(scenario)
-                
-                # Create Run
-                new_run = Run(
-                    scenario_id=scenario.id,
-                    status=RunStatus.PENDING,
-                    max_steps=scenario.config.get("max_steps", 50),
-                    seed=random.randint(1, 10000)
-                )
-                db.add(new_run)
-                await db.commit()
-                await db.refresh(new_run)
-                
-                target_run_id = new_run.id
-                scenario_name = scenario.name
-        
-        if target_run_id:
-            # Run it using existing standalone runner
-            # We use simple mode for auto runner to keep logs clean
-            console.print(f"[green]Executing run {target_run_id} ({scenario_name})...[/green]")
-            try:
-                # We need to run this function. 
-                # Note: passing specific run_id isn't supported by _run_standalone directly
-                # _run_standalone takes scenario name and creates a NEW run.
-                # We need to refactor _run_standalone or create a variant that takes a run_id.
-                # But wait, looking at _run_standalone, it creates a run.
-                
-                # Let's modify _run_standalone to accept an optional run_id!
-                # Or simply implement the execution logic here reusing the engine?
-                
-                # Reusing internal logic is better to avoid "creating" a run when we already have one.
-                
-                # Reuse logic from _run_standalone but for an existing run
-                await _execute_existing_run(target_run_id, simple=False)
-                
-            except Exception as e:
-                console.print(f"[red]Error executing run:[/red] {e}")
-                import traceback
-                traceback.print_exc()
-            
-            runs_completed += 1
-            console.print(f"[bold green]✓ Cycle completed.[/bold green]")
-            console.print("-" * 50)
-            
-            # Small delay between runs
-            await asyncio.sleep(2)
 
+                except Exception as e:
+                    console.print(f"[red]Error executing run {target_run_id}:[/red] {e}")
+                    console.print_exception()
+                    await db.rollback()
 
-async def _execute_existing_run(run_id: str, simple: bool = True):
-    """Execute an existing PENDING run"""
-    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-    from app.core.config import get_settings
-    from app.simulation.engine import SimulationEngine
-    from app.cli_monitor import SimpleEventLogger, EventRenderer
-    from rich.live import Live
+                # Drop this run's agents/steps from the identity map before the next cycle
+                db.expunge_all()
+
+                for prefetch in prefetches:
+                    try:
+                        pending_queue.extend(await prefetch)
+                    except Exception as e:
+                        # The next cycle polls again on its own
+                        console.print(f"[dim]Prefetching pending runs failed: {e}[/dim]")
+                prefetches.clear()
+
+                runs_completed += 1
+                console.print(f"[bold green]✓ Cycle completed.[/bold green]")
+                console.print("-" * 50)
+
+                # Small delay between self-created runs; queued runs are drained back to back
+                if not had_pending:
+                    await asyncio.sleep(2)
+    finally:
+        # Hand claimed runs this process won't get to back to the queue
+        for result in await asyncio.gather(*prefetches, return_exceptions=True):
+            if not isinstance(result, BaseException):
+                pending_queue.extend(result)
+        if pending_queue:
+            await db.rollback()
+            await db.execute(_RELEASE_CLAIMED_RUNS_STMT, {"run_ids": [run_id for run_id, _ in pending_queue]})
+            await db.commit()
+
+
+async def _create_preset_run(db: AsyncSession, preset_name: str) -> tuple[str, str]:
+    """Create and commit a claimed run of a built-in scenario, as (run_id, scenario_name)"""
+    cached = _PRESET_SCENARIO_CACHE.get(preset_name)
+    if cached is not None and await db.scalar(_SCENARIO_EXISTS_STMT, {"scenario_id": cached[0]}) is None:
+        # Deleted since it was cached; look it up (or recreate it) again
+        cached = None
+    if cached is None:
+        # Preset keys are the exact scenario names, so no fuzzy match is needed
+        result = await db.execute(_SCENARIO_BY_NAME_STMT, {"name": preset_name})
+        scenario = result.scalar_one_or_none()
+
+        if not scenario:
+            # Flushed only to assign its id; committed together with the run below
+            scenario = _new_preset_scenario(preset_name)
+            db.add(scenario)
+            await db.flush()
+
+        cached = (scenario.id, scenario.name, scenario.config.get("max_steps", 50))
+
+    scenario_id, scenario_name, preset_max_steps = cached
+
+    # Created already claimed: it is never visible to other workers as PENDING
+    new_run = Run(
+        scenario_id=scenario_id,
+        status=RunStatus.RUNNING,
+        max_steps=preset_max_steps,
+        seed=random.randint(1, 10000)
+    )
+    db.add(new_run)
+    await db.commit()
+    # Cached only once the scenario row is known to be committed
+    _PRESET_SCENARIO_CACHE[preset_name] = cached
+    return new_run.id, scenario_name
+
+
+def _claim_limit(count: int | None, runs_started: int) -> int:
+    """How many pending runs to claim once runs_started of count runs are under way"""
+    if count is None:
+        return _PENDING_BATCH
+    return max(0, min(_PENDING_BATCH, count - runs_started))
+
+
+async def _claim_pending_runs(db: AsyncSession, limit: int = _PENDING_BATCH) -> list[tuple[str, str]]:
+    """Claim up to limit pending runs as (run_id, scenario_name), oldest first"""
+    if not limit:
+        return []
+    result = await db.execute(_CLAIM_PENDING_RUNS_STMT, {"limit": limit})
+    # RETURNING rows come back in no particular order
+    claimed = sorted(result.all(), key=lambda row: row[2])
+    # Committed straight away so the claim is visible to other workers
+    await db.commit()
+    return [(run_id, scenario_name or "Unknown") for run_id, scenario_name, _ in claimed]
+
+
+async def _prefetch_pending_runs(limit: int) -> list[tuple[str, str]]:
+    """Claim up to limit pending runs on a session of its own"""
+    async with _db_session() as db:
+        return await _claim_pending_runs(db, limit)
+
+
+async def _execute_existing_run(
+    db: AsyncSession,
+    run_id: str,
+    simple: bool = True,
+    claimed: bool = False,
+    on_last_step: Callable[[], None] | None = None,
+):
+    """Execute an existing PENDING run using the caller's session.
+
+    A claimed run was moved to RUNNING by this process and is initialized fresh; it
+    is skipped if another process has since changed its status or advanced it.
+    on_last_step is called once, when the run's final step starts.
+    """
+    if simple:
+        logger = SimpleEventLogger(console)
+        def on_event(event_type: str, data: dict[str, Any]):
+            if event_type == "message":
+                logger.log_message(data["data"])
+            else:
+                logger.log_event(event_type, data)
+    else:
+        renderer = EventRenderer(console)
+        def on_event(event_type: str, data: dict[str, Any]):
+            if event_type == "message":
+                 renderer.add_message(data["data"])
+            else:
+                renderer.add_event(event_type, data)
+
+    if on_last_step is not None:
+        log_event = on_event
+        def on_event(event_type: str, data: dict[str, Any]):
+            log_event(event_type, data)
+            if (
+                event_type == "step_completed"
+                and sim_engine.max_steps is not None
+                and data["step"] == sim_engine.max_steps - 1
+            ):
+                on_last_step()
     
-    from sqlalchemy import select
-    from sqlalchemy.orm import selectinload
-    from app.models.run import Run, RunStatus
+    # Check run status to decide whether to load or initialize. The scenario is
+    # joined in: one round trip instead of selectinload's second SELECT
+    result = await db.execute(_RUN_WITH_SCENARIO_STMT, {"run_id": run_id})
+    run = result.scalar_one_or_none()
     
-    settings = get_settings()
-    engine = create_async_engine(settings.database_url, echo=False)
-    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    if not run:
+        console.print(f"[red]Run {run_id} not found![/red]")
+        return
     
-    async with async_session() as db:
-        
-        if simple:
-            logger = SimpleEventLogger(console)
-            def on_event(event_type: str, data: dict[str, Any]):
-                if event_type == "message":
-                    logger.log_message(data["data"])
-                else:
-                    logger.log_event(event_type, data)
-        else:
-            renderer = EventRenderer(console)
-            def on_event(event_type: str, data: dict[str, Any]):
-                if event_type == "message":
-                     renderer.add_message(data["data"])
-                else:
-                    renderer.add_event(event_type, data)
-        
-        # Initialize Engine with existing run
-        sim_engine = SimulationEngine(
-            run_id=run_id,
-            db_session=db,
-            on_event=on_event
-        )
-        
-        # Check run status to decide whether to load or initialize
-        result = await db.execute(
-            select(Run)
-            .where(Run.id == run_id)
-            .options(selectinload(Run.scenario))
-        )
-        run = result.scalar_one_or_none()
-        
-        if not run:
-            console.print(f"[red]Run {run_id} not found![/red]")
+    if claimed:
+        if run.status != RunStatus.RUNNING or run.current_step:
+            console.print(
+                f"[yellow]Run {run_id} was taken over elsewhere "
+                f"({run.status.value}, step {run.current_step}), skipping[/yellow]"
+            )
             return
+    elif run.status in (RunStatus.COMPLETED, RunStatus.FAILED, RunStatus.CANCELLED):
+        console.print(f"[yellow]Run {run_id} is already {run.status.value}, skipping[/yellow]")
+        return
 
-        if run.status == RunStatus.PENDING or (run.current_step == 0 and not run.agents):
-             # Initialize fresh
-             console.print(f"[cyan]Initializing new run from scenario: {run.scenario.name}[/cyan]")
-             
-             config = {
-                "config": run.scenario.config,
-                "agent_templates": run.scenario.agent_templates,
-                "seed": run.seed,
-            }
-             
-             # Apply max_steps override if present in run
-             if run.max_steps:
-                 config["config"]["max_steps"] = run.max_steps
-                 
-             await sim_engine.initialize(config)
-             console.print(f"[green]✓[/green] Initialized {len(sim_engine.agents)} agents")
-        else:
-             # Load existing state
-             await sim_engine.load_from_db()
-             console.print(f"[green]✓[/green] Resumed run {run_id} (step {sim_engine.current_step})")
+    # Initialize Engine with existing run
+    from app.simulation.engine import SimulationEngine
+    sim_engine = SimulationEngine(
+        run_id=run_id,
+        db_session=db,
+        on_event=on_event
+    )
+
+    if claimed or run.status == RunStatus.PENDING or (run.current_step == 0 and not run.agents):
+         # Initialize fresh
+         console.print(f"[cyan]Initializing new run from scenario: {run.scenario.name}[/cyan]")
+         
+         config = {
+            "config": run.scenario.config,
+            "agent_templates": run.scenario.agent_templates,
+            "seed": run.seed,
+        }
+         
+         # Apply max_steps override if present in run
+         if run.max_steps:
+             config["config"]["max_steps"] = run.max_steps
              
-        # Set max steps for renderer if applicable
-        if not simple and hasattr(sim_engine, 'max_steps'):
-            renderer.max_steps = sim_engine.max_steps
-        
-        # Start Simulation
-        if simple:
-            console.print("[cyan]Starting simulation...[/cyan]\n")
-            await sim_engine.start()
-        else:
-            console.print("[cyan]Starting simulation (auto-mode)...[/cyan]\n")
-            # Rich Live Display Logic
-            with Live(renderer.render_layout(), console=console, refresh_per_second=15) as live:
-                
-                async def stream_callback(agent_id: str, token: str):
-                    renderer.update_stream(agent_id, token)
-                    live.refresh()
-                
-                # Start simulation in background
-                task = asyncio.create_task(sim_engine.start(stream_callback=stream_callback))
-                
-                # Update display while running
-                while not task.done():
-                    live.update(renderer.render_layout())
-                    await asyncio.sleep(0.25)
-                
-                # Wait for task to complete and handle exceptions
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-                
-                # Final update
-                live.update(renderer.render_layout())
-        
-        console.print(f"[green]✓[/green] Simulation finished.")
+         await sim_engine.initialize(config)
+         console.print(f"[green]✓[/green] Initialized {len(sim_engine.agents)} agents")
+    else:
+         # Load existing state
+         await sim_engine.load_from_db()
+         console.print(f"[green]✓[/green] Resumed run {run_id} (step {sim_engine.current_step})")
+         
+    # Set max steps for renderer if applicable
+    if not simple and hasattr(sim_engine, 'max_steps'):
+        renderer.max_steps = sim_engine.max_steps
+    
+    # Start Simulation
+    if simple:
+        console.print("[cyan]Starting simulation...[/cyan]\n")
+        await sim_engine.start()
+    else:
+        console.print("[cyan]Starting simulation (auto-mode)...[/cyan]\n")
+        # Rich Live Display Logic
+        with Live(renderer.render_layout(), console=console, auto_refresh=False) as live:
+            
+            async def stream_callback(agent_id: str, token: str):
+                renderer.update_stream(agent_id, token)
+            
+            # Start simulation in background
+            task = asyncio.create_task(sim_engine.start(stream_callback=stream_callback))
+            
+            # Update display while running
+            await _drive_live_display(live, renderer, task)
+            
+            # Wait for task to complete and handle exceptions
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            
+            # Final update
+            live.update(renderer.render_layout(), refresh=True)
+    
+    console.print(f"[green]✓[/green] Simulation finished.")
 
 
 
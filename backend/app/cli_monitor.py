@@ -1,6 +1,10 @@
 """Rich console event renderer for CLI monitoring"""
+import asyncio
 import json
-from datetime import datetime
+import re
+import time
+from collections import OrderedDict, deque
+from itertools import islice
 from typing import Any
 
 from rich.columns import Columns
@@ -14,6 +18,61 @@ from rich.text import Text
 from rich import box
 
 
+# Context size suffix that message content may end with, e.g. " [ctx:1234]"
+_CTX_SUFFIX_RE = re.compile(r"\s*\[ctx:\d+\]\s*$")
+
+# Every fill level of the header progress, hazard and health bars, built once
+_PROGRESS_BAR_WIDTH = 20
+_PROGRESS_BARS = tuple(
+    Text.assemble(("█" * i, "green"), ("░" * (_PROGRESS_BAR_WIDTH - i), "dim"))
+    for i in range(_PROGRESS_BAR_WIDTH + 1)
+)
+_HAZARD_BARS = tuple(Text.assemble(("█" * i, "red"), ("░" * (10 - i), "dim")) for i in range(11))
+# Agent health out of 10, two points per dot
+_HEALTH_BARS = tuple("●" * i + "○" * (5 - i) for i in range(6))
+
+# Placeholder panels shown before any events or tokens arrive; they never change,
+# so idle renders reuse them
+_EMPTY_STREAM_PANEL = Panel(
+    Text("Waiting for agent activity...", style="dim italic"),
+    title="[bold]Live Stream[/bold]",
+    box=box.ROUNDED,
+    height=10,
+)
+_EMPTY_EVENT_LOG_PANEL = Panel(
+    Text("Waiting for events...", style="dim italic"),
+    title="[bold]Event Log[/bold] [dim](0 events, 0 messages)[/dim]",
+    box=box.ROUNDED,
+)
+
+
+# Last formatted wall-clock second: (epoch second, "HH:MM:SS"). Events arriving in
+# the same second reuse the string instead of formatting it again
+_hms_cache: tuple[int, str] = (0, "")
+
+
+def _now_hms(now: float | None = None) -> str:
+    """Local time as HH:MM:SS, formatted at most once per second"""
+    global _hms_cache
+    second = int(time.time() if now is None else now)
+    if _hms_cache[0] != second:
+        _hms_cache = (second, time.strftime("%H:%M:%S", time.localtime(second)))
+    return _hms_cache[1]
+
+
+def _now_hms_ms() -> str:
+    """Local time as HH:MM:SS.mmm"""
+    now = time.time()
+    return f"{_now_hms(now)}.{int(now % 1 * 1000):03d}"
+
+
+class _Clock:
+    """Current time, evaluated each time it is drawn rather than when its panel is built"""
+
+    def __rich__(self) -> Text:
+        return Text(_now_hms())
+
+
 class EventRenderer:
     """Renders simulation events to a Rich console with live updates"""
     
@@ -30,6 +89,14 @@ class EventRenderer:
         "initialized": ("blue", "⚡"),
     }
     
+    # Regions whose panels depend only on renderer state (the world clock is drawn
+    # lazily); they are rebuilt when that state changes. "stream" (cursor) is rebuilt
+    # every render.
+    CACHED_REGIONS = ("header", "world", "conversations", "right", "events")
+    
+    # Agents shown side by side in the live stream panel
+    MAX_ACTIVE_STREAMS = 3
+    
     MESSAGE_STYLES = {
         "direct": ("blue", "✉"),
         "broadcast": ("yellow", "📢"),
@@ -37,10 +104,25 @@ class EventRenderer:
         "conversation": ("cyan", "💬"),
     }
     
-    def __init__(self, console: Console | None = None):
+    STATUS_COLORS = {
+        "idle": "dim",
+        "ready": "blue",
+        "running": "green",
+        "paused": "yellow",
+        "stopped": "red",
+        "completed": "green bold",
+    }
+    
+    WEATHER_ICONS = {"heavy_rain": "🌧", "storm": "⛈", "clear": "☀", "cloudy": "☁"}
+    
+    def __init__(self, console: Console | None = None, max_events: int = 50):
         self.console = console or Console()
-        self.events: list[dict[str, Any]] = []
-        self.max_events = 50  # Keep last N events
+        # Ring buffer of the last max_events events; old entries drop off in O(1)
+        self.max_events = max_events
+        self.events: deque[dict[str, Any]] = deque(maxlen=max_events)
+        # Running totals, since the buffer only holds the most recent entries
+        self.total_events = 0
+        self.total_messages = 0
         
         # Current state
         self.current_step = 0
@@ -48,16 +130,30 @@ class EventRenderer:
         self.world_state: dict[str, Any] = {}
         self.conversations: list[dict[str, Any]] = []
         self.agents: dict[str, dict[str, Any]] = {}
-        self.conversations: list[dict[str, Any]] = []
-        self.agents: dict[str, dict[str, Any]] = {}
         self.run_status = "idle"
+        # Latest action per agent id, kept up to date as events and messages arrive
+        self.last_actions: dict[str, str] = {}
         
         # Streaming state
         self.current_stream_agent: str | None = None
         self.current_stream_text: str = ""
         self.current_stream_token_count: int = 0
-        self._stream_cycler_index: int = 0
-        self._last_cycle_time: float = 0
+        # Most recently streaming agents first: agent_id -> {id, name, text, time}
+        self._active_streams: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        # Tokens received since the last render, as consecutive (agent_id, tokens) runs
+        self._pending_tokens: list[tuple[str, list[str]]] = []
+        
+        # Layout skeleton built once; render_layout() only swaps the panels in its regions
+        self._layout = self._build_layout()
+        self._regions = {
+            name: self._layout[name]
+            for name in ("header", "world", "conversations", "right", "stream", "events")
+        }
+        # Set by every state change; the live display waits on it instead of polling
+        self.updated = asyncio.Event()
+        self.updated.set()
+        # Cached regions to rebuild on the next render_layout()
+        self._stale: set[str] = set(self.CACHED_REGIONS)
 
         
     def add_event(self, event_type: str, data: dict[str, Any]) -> None:
@@ -65,66 +161,114 @@ class EventRenderer:
         event = {
             "type": event_type,
             "data": data,
-            "timestamp": datetime.now().strftime("%H:%M:%S"),
+            "timestamp": _now_hms(),
         }
         self.events.append(event)
-        
-        # Trim old events
-        if len(self.events) > self.max_events:
-            self.events = self.events[-self.max_events:]
+        self.total_events += 1
         
         # Update state from events
         self._update_state(event_type, data)
+        self.mark_dirty("events")
     
     def add_message(self, message: dict[str, Any]) -> None:
         """Add a message event"""
         event = {
             "type": "message",
             "data": message,
-            "timestamp": datetime.now().strftime("%H:%M:%S"),
+            "timestamp": _now_hms(),
         }
         self.events.append(event)
-        
-        if len(self.events) > self.max_events:
-            self.events = self.events[-self.max_events:]
+        self.total_messages += 1
+        # from_agent is usually the sender's id
+        agent_id = message.get("from_agent_id", message.get("from_agent"))
+        if agent_id:
+            self.last_actions[agent_id] = f"Msg ({message.get('message_type', 'direct')})"
+        # The agents panel shows the last action
+        self.mark_dirty("events", "right")
     
     def update_stream(self, agent_id: str, token: str) -> None:
-        """Update the current stream with a new token"""
-        # If agent changed, reset
-        if self.current_stream_agent != agent_id:
-            self.current_stream_agent = agent_id
-            self.current_stream_text = ""
-            self.current_stream_token_count = 0
-            
-        self.current_stream_text += token
-        self.current_stream_token_count += 1
-        
-        # Keep text length reasonable
-        if len(self.current_stream_text) > 1000:
-            self.current_stream_text = "..." + self.current_stream_text[-997:]
+        """Queue a streamed token; it is applied on the next flush_streams()"""
+        pending = self._pending_tokens
+        if pending and pending[-1][0] == agent_id:
+            pending[-1][1].append(token)
+        else:
+            pending.append((agent_id, [token]))
+        self.mark_dirty()
+
+    def flush_streams(self) -> None:
+        """Apply queued tokens to the current stream in one pass per agent run"""
+        for agent_id, tokens in self._pending_tokens:
+            # If agent changed, reset
+            if self.current_stream_agent != agent_id:
+                self.current_stream_agent = agent_id
+                self.current_stream_text = ""
+                self.current_stream_token_count = 0
+
+            self.current_stream_text += "".join(tokens)
+            self.current_stream_token_count += len(tokens)
+
+            # Keep text length reasonable
+            if len(self.current_stream_text) > 1000:
+                self.current_stream_text = "..." + self.current_stream_text[-997:]
+            self._touch_active_stream()
+        self._pending_tokens.clear()
+
+    def _touch_active_stream(self) -> None:
+        """Move the current stream to the front of the active streams"""
+        agent_id = self.current_stream_agent
+        stream = self._active_streams.get(agent_id)
+        if stream is None:
+            name = self.agents.get(agent_id, {}).get("name", agent_id)
+            stream = self._active_streams[agent_id] = {"id": agent_id, "name": name}
+        stream["text"] = self.current_stream_text
+        stream["time"] = time.monotonic()
+        self._active_streams.move_to_end(agent_id, last=False)
+        if len(self._active_streams) > self.MAX_ACTIVE_STREAMS:
+            self._active_streams.popitem()
+
+    def mark_dirty(self, *regions: str) -> None:
+        """Flag that the layout needs redrawing, rebuilding the given cached regions"""
+        self.updated.set()
+        self._stale.update(regions)
+
+    def consume_dirty(self) -> bool:
+        """Return whether a redraw is due and clear the flag"""
+        dirty = self.updated.is_set()
+        self.updated.clear()
+        return dirty
 
     def _update_state(self, event_type: str, data: dict[str, Any]) -> None:
-        """Update internal state from events"""
+        """Update internal state from events, marking the regions that show it"""
         if event_type == "step_completed":
             self.current_step = data.get("step", self.current_step)
             self.world_state = data.get("world_state", self.world_state)
             self.conversations = data.get("conversations", self.conversations)
             self.agents = self.world_state.get("agents", self.agents)
+            self.mark_dirty("header", "world", "conversations", "right")
         elif event_type == "initialized":
             self.run_status = "ready"
             # Update world state and agents from initialization
             self.world_state = data.get("world_state", self.world_state)
             self.agents = self.world_state.get("agents", self.agents)
             self.conversations = data.get("conversations", [])
+            self.mark_dirty("header", "world", "conversations", "right")
         elif event_type == "run_started":
             self.run_status = "running"
             self.current_step = data.get("step", 0)
+            self.mark_dirty("header")
+        elif event_type == "agent_moved":
+            if data.get("agent_id"):
+                self.last_actions[data["agent_id"]] = f"Moved to {data.get('to', '?')}"
+                self.mark_dirty("right")
         elif event_type == "run_paused":
             self.run_status = "paused"
+            self.mark_dirty("header")
         elif event_type == "run_stopped":
             self.run_status = "stopped"
+            self.mark_dirty("header")
         elif event_type == "run_completed":
             self.run_status = "completed"
+            self.mark_dirty("header")
         elif event_type == "connected":
             # WebSocket initial status
             status_data = data
@@ -132,25 +276,16 @@ class EventRenderer:
             self.current_step = status_data.get("current_step", self.current_step)
             self.max_steps = status_data.get("max_steps", self.max_steps)
             self.world_state = status_data.get("world_state", self.world_state)
+            self.mark_dirty("header", "world")
     
     def render_header(self) -> Panel:
         """Render the header panel with status"""
         # Status indicator
-        status_colors = {
-            "idle": "dim",
-            "ready": "blue",
-            "running": "green",
-            "paused": "yellow",
-            "stopped": "red",
-            "completed": "green bold",
-        }
-        status_color = status_colors.get(self.run_status, "white")
+        status_color = self.STATUS_COLORS.get(self.run_status, "white")
         
-        # Progress bar - use Text.from_markup to ensure tags are parsed
+        # Progress bar, picked from the precomputed bars
         progress = self.current_step / max(self.max_steps, 1)
-        bar_width = 20
-        filled = int(progress * bar_width)
-        bar_markup = f"[green]{'█' * filled}[/green][dim]{'░' * (bar_width - filled)}[/dim]"
+        filled = max(0, min(int(progress * _PROGRESS_BAR_WIDTH), _PROGRESS_BAR_WIDTH))
         
         header_text = Text()
         header_text.append("EmotionSim Monitor", style="bold cyan")
@@ -160,7 +295,7 @@ class EventRenderer:
         header_text.append("  │  ", style="dim")
         header_text.append(f"Step: {self.current_step}/{self.max_steps}", style="white")
         header_text.append("  ", style="white")
-        header_text.append_text(Text.from_markup(bar_markup))
+        header_text.append_text(_PROGRESS_BARS[filled])
         
         return Panel(header_text, box=box.ROUNDED, style="cyan")
     
@@ -171,17 +306,15 @@ class EventRenderer:
         table.add_column("Value")
         
         # System Time
-        table.add_row("Sys Time", datetime.now().strftime("%H:%M:%S"))
+        table.add_row("Sys Time", _Clock())
         
         # Hazard level with bar
         hazard = int(self.world_state.get("hazard_level", 0))
-        hazard_bar = f"[red]{'█' * hazard}[/red][dim]{'░' * (10 - hazard)}[/dim]"
-        table.add_row("Hazard", f"{hazard}/10 {hazard_bar}")
+        table.add_row("Hazard", Text.assemble(f"{hazard}/10 ", _HAZARD_BARS[max(0, min(hazard, 10))]))
         
         # Weather
         weather = self.world_state.get("weather", "unknown")
-        weather_icons = {"heavy_rain": "🌧", "storm": "⛈", "clear": "☀", "cloudy": "☁"}
-        table.add_row("Weather", f"{weather_icons.get(weather, '?')} {weather}")
+        table.add_row("Weather", f"{self.WEATHER_ICONS.get(weather, '?')} {weather}")
         
         # Time
         time_of_day = self.world_state.get("time_of_day", "unknown")
@@ -252,36 +385,7 @@ class EventRenderer:
             table.add_column("State", style="green", ratio=1)
             table.add_column("Last Action", style="dim white", ratio=3)
             
-            # Find last action for each agent
-            last_actions = {}
-            for event in self.events:
-                evt_type = event.get("type")
-                data = event.get("data", {})
-                
-                # Check different event types for action info
-                agent_id = None
-                action_desc = None
-                
-                if evt_type == "agent_moved":
-                    agent_id = data.get("agent_id")
-                    if agent_id:
-                        to_loc = data.get("to", "?")
-                        action_desc = f"Moved to {to_loc}"
-                        
-                elif evt_type == "message":
-                    agent_id = data.get("from_agent_id", data.get("from_agent")) # from_agent is ID often
-                    # Need to verify if from_agent is ID or Name. Usually ID in backend data.
-                    # Looking at add_message, it takes message dict.
-                    if agent_id:
-                        msg_type = data.get("message_type", "direct")
-                        action_desc = f"Msg ({msg_type})"
-                    
-                # Store if found (overwriting older ones since we iterate forward? No events are appended, so last is newest? 
-                # events list is appended to. So iterating forward gives latest at end.
-                if agent_id and action_desc:
-                    last_actions[agent_id] = action_desc
-            
-            for agent_id, agent_data in list(self.agents.items())[:8]:
+            for agent_id, agent_data in islice(self.agents.items(), 8):
                 name = agent_data.get("name", agent_id)[:15]
                 location = agent_data.get("location", "?")[:12]
                 health = agent_data.get("health", "?")
@@ -289,8 +393,7 @@ class EventRenderer:
                 
                 # Health bar
                 if isinstance(health, (int, float)):
-                    health_val = int(health)
-                    health_bar = f"{'●' * (health_val // 2)}{'○' * (5 - (health_val // 2))}"
+                    health_bar = _HEALTH_BARS[max(0, min(int(health) // 2, 5))]
                 else:
                     health_bar = str(health)
                 
@@ -298,7 +401,7 @@ class EventRenderer:
                 state_str = f"{health_bar} S:{stress}"
                 
                 # Last action
-                last_act = last_actions.get(agent_id, "-")
+                last_act = self.last_actions.get(agent_id, "-")
                 
                 table.add_row(name, location, state_str, last_act)
             
@@ -309,16 +412,93 @@ class EventRenderer:
     def render_event_log(self) -> Panel:
         """Render the event log panel"""
         if not self.events:
-            content = Text("Waiting for events...", style="dim italic")
-        else:
-            lines = []
-            for event in reversed(self.events[-15:]):  # Show last 15
-                line = self._format_event(event)
-                lines.append(line)
-            content = Group(*lines)
+            return _EMPTY_EVENT_LOG_PANEL
+        
+        lines = []
+        for event in islice(reversed(self.events), 15):  # Show last 15
+            line = self._format_event(event)
+            lines.append(line)
+        content = Group(*lines)
         
-        return Panel(content, title="[bold]Event Log[/bold]", box=box.ROUNDED)
+        title = f"[bold]Event Log[/bold] [dim]({self.total_events} events, {self.total_messages} messages)[/dim]"
+        return Panel(content, title=title, box=box.ROUNDED)
     
+    @staticmethod
+    def _agent_label(data: dict[str, Any]) -> str:
+        """Agent name and short id, e.g. 'Ann (1a2b3c4d)'"""
+        agent_id = data.get("agent_id", "?")
+        return f"{data.get('agent_name', agent_id)} ({agent_id[:8]})"
+
+    @staticmethod
+    def _format_step(text: Text, data: dict[str, Any]) -> None:
+        step = data.get("step", "?")
+        text.append(f" Step {step}", style="dim")
+
+    @staticmethod
+    def _format_agent_moved(text: Text, data: dict[str, Any]) -> None:
+        from_loc = data.get("from", "?")
+        to_loc = data.get("to", "?")
+        text.append(f" {EventRenderer._agent_label(data)}: {from_loc} → {to_loc}", style="magenta")
+
+    @staticmethod
+    def _format_agent_error(text: Text, data: dict[str, Any]) -> None:
+        error = data.get("error", "")[:60]
+        context = data.get("context", "")
+        text.append(f" {EventRenderer._agent_label(data)}: {error}", style="red")
+        if context:
+            text.append(f" [{context}]", style="dim")
+
+    @staticmethod
+    def _format_movement_failed(text: Text, data: dict[str, Any]) -> None:
+        from_loc = data.get("from", "?")
+        to_loc = data.get("to", "?")
+        # Graceful format; the failure reason is not shown
+        text.append(f" {EventRenderer._agent_label(data)}: Checked path to {to_loc}", style="dim")
+        text.append(" → Unreachable. Staying at ", style="dim")
+        text.append(f"{from_loc}", style="dim underline")
+        text.append(".", style="dim")
+
+    @staticmethod
+    def _format_location_created(text: Text, data: dict[str, Any]) -> None:
+        location = data.get("location", "?")
+        connected_to = data.get("connected_to", "?")
+        dist = data.get("distance", 1)
+        text.append(
+            f" {EventRenderer._agent_label(data)}: discovered '{location}' (dist: {dist}, connected to {connected_to})",
+            style="cyan",
+        )
+
+    @staticmethod
+    def _format_travel_started(text: Text, data: dict[str, Any]) -> None:
+        from_loc = data.get("from", "?")
+        to_loc = data.get("to", "?")
+        distance = data.get("distance", "?")
+        text.append(
+            f" {EventRenderer._agent_label(data)}: started travel {from_loc} → {to_loc} (dist: {distance})",
+            style="magenta",
+        )
+
+    @staticmethod
+    def _format_agent_travelling(text: Text, data: dict[str, Any]) -> None:
+        target = data.get("target", "?")
+        progress = data.get("progress", "?")
+        distance = data.get("distance", "?")
+        text.append(
+            f" {EventRenderer._agent_label(data)}: travelling to {target} ({progress}/{distance})",
+            style="magenta dim",
+        )
+
+    # System event details by event type; other events show their step, if any
+    _EVENT_FORMATTERS = {
+        "step_completed": _format_step,
+        "agent_moved": _format_agent_moved,
+        "agent_error": _format_agent_error,
+        "movement_failed": _format_movement_failed,
+        "location_created": _format_location_created,
+        "travel_started": _format_travel_started,
+        "agent_travelling": _format_agent_travelling,
+    }
+
     def _format_event(self, event: dict[str, Any]) -> Text:
         """Format a single event for display"""
         timestamp = event.get("timestamp", "")
@@ -336,9 +516,9 @@ class EventRenderer:
             from_name = data.get("from_agent_name", data.get("from_agent", "?"))
             content = data.get("content", "")
             
-            # Strip context metadata suffix like [ctx:1234]
-            import re
-            content = re.sub(r'\s*\[ctx:\d+\]\s*$', '', content)
+            # Strip context metadata suffix like [ctx:1234]; most messages have none
+            if "[ctx:" in content:
+                content = _CTX_SUFFIX_RE.sub("", content)
             content = content[:200]  # Limit length
             
             if msg_type == "conversation":
@@ -366,56 +546,9 @@ class EventRenderer:
             text.append(f"{event_type.upper()}", style=style)
             
             # Add relevant details
-            if event_type == "step_completed":
-                step = data.get("step", "?")
-                text.append(f" Step {step}", style="dim")
-            elif event_type == "agent_moved":
-                agent_name = data.get("agent_name", data.get("agent_id", "?"))
-                agent_id = data.get("agent_id", "?")
-                from_loc = data.get("from", "?")
-                to_loc = data.get("to", "?")
-                text.append(f" {agent_name} ({agent_id[:8]}): {from_loc} → {to_loc}", style="magenta")
-            elif event_type == "agent_error":
-                agent_name = data.get("agent_name", data.get("agent_id", "?"))
-                agent_id = data.get("agent_id", "?")
-                error = data.get("error", "")[:60]
-                context = data.get("context", "")
-                text.append(f" {agent_name} ({agent_id[:8]}): {error}", style="red")
-                if context:
-                    text.append(f" [{context}]", style="dim")
-            elif event_type == "movement_failed":
-                agent_name = data.get("agent_name", data.get("agent_id", "?"))
-                agent_id = data.get("agent_id", "?")
-                from_loc = data.get("from", "?")
-                to_loc = data.get("to", u"?")
-                # reason = data.get("reason", "Unknown reason") # Unused in graceful mode
-                
-                # Graceful format
-                text.append(f" {agent_name} ({agent_id[:8]}): Checked path to {to_loc}", style="dim")
-                text.append(" → Unreachable. Staying at ", style="dim")
-                text.append(f"{from_loc}", style="dim underline")
-                text.append(".", style="dim")
-            elif event_type == "location_created":
-                agent_name = data.get("agent_name", data.get("agent_id", "?"))
-                agent_id = data.get("agent_id", "?")
-                location = data.get("location", "?")
-                connected_to = data.get("connected_to", "?")
-                dist = data.get("distance", 1)
-                text.append(f" {agent_name} ({agent_id[:8]}): discovered '{location}' (dist: {dist}, connected to {connected_to})", style="cyan")
-            elif event_type == "travel_started":
-                agent_name = data.get("agent_name", data.get("agent_id", "?"))
-                agent_id = data.get("agent_id", "?")
-                from_loc = data.get("from", "?")
-                to_loc = data.get("to", "?")
-                distance = data.get("distance", "?")
-                text.append(f" {agent_name} ({agent_id[:8]}): started travel {from_loc} → {to_loc} (dist: {distance})", style="magenta")
-            elif event_type == "agent_travelling":
-                agent_name = data.get("agent_name", data.get("agent_id", "?"))
-                agent_id = data.get("agent_id", "?")
-                target = data.get("target", "?")
-                progress = data.get("progress", "?")
-                distance = data.get("distance", "?")
-                text.append(f" {agent_name} ({agent_id[:8]}): travelling to {target} ({progress}/{distance})", style="magenta dim")
+            formatter = self._EVENT_FORMATTERS.get(event_type)
+            if formatter is not None:
+                formatter(text, data)
             elif "step" in data:
                 text.append(f" (step {data['step']})", style="dim")
         
@@ -425,87 +558,41 @@ class EventRenderer:
     
     def render_active_stream(self) -> Panel:
         """Render the active streaming agent response in 3 columns"""
-        # We need to track the last 3 active agents
-        # This requires tracking state beyond just the single current stream
-        # Implementation:
-        # 1. Maintain a list of (agent_id, content, timestamp) tuples
-        # 2. When update_stream is called, update the entry for that agent or move to top
-        
-        # NOTE: This method assumes self._active_streams exists. 
-        # Since we can't easily add __init__ attributes in a patch without replacing the whole class,
-        # we'll initialize it safely here if missing.
-        if not hasattr(self, "_active_streams"):
-            self._active_streams = [] # List of dicts: {id, name, text, time}
-
-        # Sync current stream to _active_streams
-        if self.current_stream_agent:
-            agent_name = self.agents.get(self.current_stream_agent, {}).get("name", self.current_stream_agent)
-            
-            # Check if already in list
-            found = False
-            for s in self._active_streams:
-                if s["id"] == self.current_stream_agent:
-                    s["text"] = self.current_stream_text
-                    s["time"] = datetime.now()
-                    # Move to front
-                    self._active_streams.remove(s)
-                    self._active_streams.insert(0, s)
-                    found = True
-                    break
-            
-            if not found:
-                self._active_streams.insert(0, {
-                    "id": self.current_stream_agent,
-                    "name": agent_name,
-                    "text": self.current_stream_text,
-                    "time": datetime.now()
-                })
-                
-            # Keep only 3
-            self._active_streams = self._active_streams[:3]
-
         # If no streams at all, show placeholdler
         if not self._active_streams:
-             return Panel(
-                Text("Waiting for agent activity...", style="dim italic"),
-                title="[bold]Live Stream[/bold]",
-                box=box.ROUNDED,
-                height=10
-            )
+            return _EMPTY_STREAM_PANEL
 
         # Create panels for top 3 streams
         panels = []
-        for i in range(3):
-            if i < len(self._active_streams):
-                stream = self._active_streams[i]
-                
-                # Format content
-                content = Text()
-                content.append(f"{stream['name']}\n", style="bold cyan")
-                
-                # Show raw text (full JSON)
-                text_preview = stream['text']
-                # show last N chars if too long
-                if len(text_preview) > 300:
-                    text_preview = "..." + text_preview[-297:]
-                    
-                content.append(text_preview, style="white")
-                
-                # Active indicator
-                if stream["id"] == self.current_stream_agent:
-                     if int(datetime.now().timestamp() * 2) % 2 == 0:
-                        content.append(" █", style="green")
-                
-                # Dim if old (> 10 seconds)
-                time_diff = (datetime.now() - stream["time"]).total_seconds()
-                border_style = "green" if time_diff < 5 else "dim"
+        for stream in islice(self._active_streams.values(), self.MAX_ACTIVE_STREAMS):
+            # Format content
+            content = Text()
+            content.append(f"{stream['name']}\n", style="bold cyan")
+            
+            # Show raw text (full JSON)
+            text_preview = stream['text']
+            # show last N chars if too long
+            if len(text_preview) > 300:
+                text_preview = "..." + text_preview[-297:]
                 
-                panels.append(
-                    Panel(content, style=border_style, height=8, box=box.ROUNDED)
-                )
-            else:
-                # Empty slot
-                panels.append(Panel("", box=box.ROUNDED, height=8, style="dim"))
+            content.append(text_preview, style="white")
+            
+            # Active indicator
+            if stream["id"] == self.current_stream_agent:
+                 if int(time.monotonic() * 2) % 2 == 0:
+                    content.append(" █", style="green")
+            
+            # Dim if old (> 10 seconds)
+            time_diff = time.monotonic() - stream["time"]
+            border_style = "green" if time_diff < 5 else "dim"
+            
+            panels.append(
+                Panel(content, style=border_style, height=8, box=box.ROUNDED)
+            )
+
+        # Empty slots
+        while len(panels) < self.MAX_ACTIVE_STREAMS:
+            panels.append(Panel("", box=box.ROUNDED, height=8, style="dim"))
 
         return Panel(
             Columns(panels, equal=True, expand=True),
@@ -513,8 +600,9 @@ class EventRenderer:
             box=box.ROUNDED
         )
 
-    def render_layout(self) -> Layout:
-        """Render the full layout"""
+    @staticmethod
+    def _build_layout() -> Layout:
+        """Build the empty layout skeleton"""
         layout = Layout()
         
         layout.split_column(
@@ -534,24 +622,58 @@ class EventRenderer:
             Layout(name="conversations", ratio=1),
         )
         
-        layout["right"].update(self.render_agents())
-        
-        layout["header"].update(self.render_header())
-        layout["world"].update(self.render_world_state())
-        layout["conversations"].update(self.render_conversations())
-        layout["conversations"].update(self.render_conversations())
-        layout["stream"].update(self.render_active_stream())
-        layout["events"].update(self.render_event_log())
-        
         return layout
+    
+    def render_layout(self) -> Layout:
+        """Render the full layout, refreshing the changed panels of the one built at init"""
+        self.flush_streams()
+        regions = self._regions
+        stale = self._stale
+        
+        if "right" in stale:
+            regions["right"].update(self.render_agents())
+        if "header" in stale:
+            regions["header"].update(self.render_header())
+        if "world" in stale:
+            regions["world"].update(self.render_world_state())
+        if "conversations" in stale:
+            regions["conversations"].update(self.render_conversations())
+        regions["stream"].update(self.render_active_stream())
+        if "events" in stale:
+            regions["events"].update(self.render_event_log())
+        stale.clear()
+        
+        return self._layout
 
 
 class SimpleEventLogger:
     """Simple streaming logger for non-interactive mode"""
     
-    def __init__(self, console: Console | None = None):
+    EVENT_COLORS = {
+        "step_completed": "cyan",
+        "run_started": "green",
+        "run_completed": "green bold",
+        "run_paused": "yellow",
+        "run_stopped": "red",
+        "agent_error": "red bold",
+        "agent_moved": "magenta",
+        "movement_failed": "red",
+        "initialized": "blue",
+    }
+    
+    MESSAGE_COLORS = {
+        "direct": "blue",
+        "broadcast": "yellow",
+        "room": "green",
+        "conversation": "cyan",
+    }
+    
+    def __init__(self, console: Console | None = None, fast: bool = False):
         self.console = console or Console()
         self.last_stream_agent: str | None = None
+        # Fast mode writes whole lines with console.out: one style per line,
+        # no markup parsing or highlighting
+        self.fast = fast
     
     def log_event(self, event_type: str, data: dict[str, Any]) -> None:
         """Log an event to console"""
@@ -560,25 +682,23 @@ class SimpleEventLogger:
             self.console.print()
             self.last_stream_agent = None
 
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        timestamp = _now_hms_ms()
         
         # Color based on event type
-        colors = {
-            "step_completed": "cyan",
-            "run_started": "green",
-            "run_completed": "green bold",
-            "run_paused": "yellow",
-            "run_stopped": "red",
-            "agent_error": "red bold",
-            "agent_moved": "magenta",
-            "movement_failed": "red",
-            "initialized": "blue",
-        }
-        color = colors.get(event_type, "white")
+        color = self.EVENT_COLORS.get(event_type, "white")
         
-        self.console.print(
-            f"[dim]{timestamp}[/dim] [{color}]{event_type:20}[/{color}] {self._summarize(event_type, data)}"
-        )
+        if self.fast:
+            self.console.out(
+                f"{timestamp} {event_type:20} {self._summarize(event_type, data)}",
+                style=color,
+                highlight=False,
+            )
+            return
+        
+        # Assembled from styled parts: nothing to parse, and event data can't inject markup
+        self.console.print(Text.assemble(
+            (timestamp, "dim"), " ", (f"{event_type:20}", color), " ", self._summarize(event_type, data),
+        ))
     
     def log_message(self, message: dict[str, Any]) -> None:
         """Log a message to console"""
@@ -587,36 +707,46 @@ class SimpleEventLogger:
             self.console.print()
             self.last_stream_agent = None
             
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        timestamp = _now_hms_ms()
         
         msg_type = message.get("message_type", "direct")
         from_name = message.get("from_agent_name", message.get("from_agent", "?"))
         content = message.get("content", "")[:200]  # Increased from 80 to show full messages
         
-        type_colors = {
-            "direct": "blue",
-            "broadcast": "yellow",
-            "room": "green",
-            "conversation": "cyan",
-        }
-        color = type_colors.get(msg_type, "white")
+        color = self.MESSAGE_COLORS.get(msg_type, "white")
+        
+        if self.fast:
+            if msg_type == "conversation":
+                line = f"{timestamp} 💬 [{message.get('location', '?')}] {from_name}: \"{content}\""
+            else:
+                to_target = message.get("to_agent_name", message.get("to_target", "all"))
+                line = f"{timestamp} MSG {from_name} → {to_target}: \"{content}\""
+            self.console.out(line, style=color, highlight=False)
+            if "metadata" in message and "context_size" in message["metadata"]:
+                self.console.out(
+                    f"    Context size: {message['metadata']['context_size']} chars",
+                    style="dim",
+                    highlight=False,
+                )
+            return
         
+        # Agent names and content are model output: keep them out of markup
         if msg_type == "conversation":
             location = message.get("location", "?")
-            self.console.print(
-                f"[dim]{timestamp}[/dim] [{color}]💬 [{location}][/{color}] "
-                f"[bold]{from_name}:[/bold] \"{content}\""
-            )
+            self.console.print(Text.assemble(
+                (timestamp, "dim"), " ", (f"💬 [{location}]", color), " ",
+                (f"{from_name}:", "bold"), f" \"{content}\"",
+            ))
         else:
             to_target = message.get("to_agent_name", message.get("to_target", "all"))
-            self.console.print(
-                f"[dim]{timestamp}[/dim] [{color}]MSG[/{color}] "
-                f"[bold]{from_name}[/bold] → {to_target}: \"{content}\""
-            )
+            self.console.print(Text.assemble(
+                (timestamp, "dim"), " ", ("MSG", color), " ",
+                (str(from_name), "bold"), f" → {to_target}: \"{content}\"",
+            ))
         
         # Log context size if available
         if "metadata" in message and "context_size" in message["metadata"]:
-            self.console.print(f"    [dim]Context size: {message['metadata']['context_size']} chars[/dim]")
+            self.console.print(Text(f"    Context size: {message['metadata']['context_size']} chars", style="dim"))
             
     def log_token(self, agent_id: str, token: str, agent_name: str | None = None) -> None:
         """Log a streaming token"""
@@ -625,10 +755,13 @@ class SimpleEventLogger:
                 self.console.print()  # Newline after previous agent
             
             name = agent_name or agent_id
-            self.console.print(f"\n[bold cyan]{name}:[/bold cyan] ", end="")
+            self.console.print(Text(f"\n{name}: ", style="bold cyan"), end="")
             self.last_stream_agent = agent_id
-            
-        self.console.print(token, end="")
+        
+        if self.fast:
+            self.console.out(token, end="", highlight=False)
+        else:
+            self.console.print(token, end="", markup=False, highlight=False)
     
     def _summarize(self, event_type: str, data: dict[str, Any]) -> str:
         """Create a summary string from event data"""
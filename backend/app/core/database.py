@@ -1,15 +1,61 @@
 """Database connection and session management"""
+import json
+import math
+from typing import Any
+
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import get_settings
 
+
+def _has_non_finite(value: Any) -> bool:
+    """Whether a JSON value contains NaN or an infinity anywhere"""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite(item) for item in value)
+    return False
+
+
+def json_serializer(value: Any) -> str:
+    """Encode JSON columns (world state, metrics, templates) with orjson.
+
+    Values orjson would change or reject are written by json.dumps instead, so stored
+    data matches json.dumps: orjson writes NaN and infinities as null and raises on
+    integers wider than 64 bits.
+    """
+    try:
+        # Non-str keys become strings, as with json.dumps
+        encoded = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        return json.dumps(value)
+    # Only a null in the output can stand for a non-finite float
+    if b"null" in encoded and _has_non_finite(value):
+        return json.dumps(value)
+    return encoded.decode()
+
+
+def json_deserializer(value: str | bytes) -> Any:
+    """Decode JSON columns with orjson"""
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        # NaN and Infinity, as json.dumps writes them
+        return json.loads(value)
+
+
 settings = get_settings()
 
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     future=True,
+    json_serializer=json_serializer,
+    json_deserializer=json_deserializer,
 )
 
 async_session_maker = async_sessionmaker(
@@ -22,7 +22,7 @@ class Scenario(Base):
         primary_key=True,
         default=lambda: str(uuid.uuid4())
     )
-    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     description: Mapped[str] = mapped_column(Text, nullable=True)
     
     # Configuration JSON containing world parameters
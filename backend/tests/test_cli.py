@@ -0,0 +1,530 @@
+"""Tests for the CLI helpers"""
+import asyncio
+import json
+import os
+import threading
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from rich.console import Console
+from sqlalchemy import create_engine, inspect, select, text, update
+
+import app.cli as cli
+import app.scenarios.storage as storage
+from app.cli import _find_default_scenario, _health_url_for, _new_preset_scenario, _preset_payload
+from app.cli_monitor import EventRenderer
+from app.core.config import get_settings
+from app.core.database import Base
+from app.models.run import Run, RunStatus
+from app.models.scenario import Scenario
+from app.scenarios.defaults import DEFAULT_SCENARIOS
+
+
+class TestPresetHelpers:
+    """Tests for built-in scenario lookup and creation"""
+
+    def test_find_default_scenario(self):
+        """Test exact and partial case-insensitive lookups"""
+        name = next(iter(DEFAULT_SCENARIOS))
+
+        assert _find_default_scenario(name) == name
+        assert _find_default_scenario(name.upper()) == name
+        assert _find_default_scenario("flood").startswith("Rising Flood")
+        assert _find_default_scenario("no such scenario") is None
+
+    @pytest.mark.parametrize("name", list(DEFAULT_SCENARIOS))
+    def test_new_preset_scenario(self, name):
+        """Test that preset rows match their creator and don't share state"""
+        expected = DEFAULT_SCENARIOS[name]()
+        scenario = _new_preset_scenario(name)
+
+        assert scenario.name == expected.name == name
+        assert scenario.config == expected.config.model_dump()
+        assert len(scenario.agent_templates) == len(expected.agent_templates)
+
+        scenario.config["max_steps"] = -1
+        assert _preset_payload(name)["config"]["max_steps"] != -1
+        assert _new_preset_scenario(name).config["max_steps"] != -1
+
+
+class TestGeneratedScenarios:
+    """Tests for the cached generated scenario listing"""
+
+    @pytest.fixture
+    def scenarios_dir(self, tmp_path):
+        """Point both the loader and the cache at an empty directory"""
+        with patch.object(storage, "SCENARIOS_DIR", tmp_path), \
+                patch.object(cli, "SCENARIOS_DIR", tmp_path), \
+                patch.object(cli, "_generated_cache", None):
+            yield tmp_path
+
+    def _write(self, directory, name, agents=1):
+        path = directory / f"{name}.json"
+        path.write_text(json.dumps({
+            "name": name,
+            "description": "",
+            "generated_at": "2024-01-01T00:00:00",
+            "config": {"max_steps": 5},
+            "agent_templates": [{"role": "human"}] * agents,
+        }))
+        return path
+
+    def test_listing_is_cached_until_files_change(self, scenarios_dir):
+        """Test that files are parsed once and re-read after a change"""
+        path = self._write(scenarios_dir, "Quake")
+
+        with patch.object(cli, "load_generated_scenarios", wraps=storage.load_generated_scenarios) as load:
+            first = cli._generated_scenarios()
+            assert cli._generated_scenarios() is first
+            assert load.call_count == 1
+
+            self._write(scenarios_dir, "Quake", agents=3)
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            assert cli._generated_scenarios()[0]["agent_count"] == 3
+
+            self._write(scenarios_dir, "Storm")
+            assert len(cli._generated_scenarios()) == 2
+            assert load.call_count == 3
+
+    def test_find_generated_scenario(self, scenarios_dir):
+        """Test exact, partial and filename lookups, preferring exact names"""
+        self._write(scenarios_dir, "Quake Aftermath")
+        self._write(scenarios_dir, "Quake")
+
+        assert cli._find_generated_scenario("quake")["name"] == "Quake"
+        assert cli._find_generated_scenario("after")["name"] == "Quake Aftermath"
+        assert cli._find_generated_scenario("Quake Aftermath.json")["name"] == "Quake Aftermath"
+        assert cli._find_generated_scenario("storm") is None
+
+    def test_new_generated_scenario_copies(self, scenarios_dir):
+        """Test that rows don't share mutable state with the cache"""
+        self._write(scenarios_dir, "Quake")
+        data = cli._generated_scenarios()[0]
+
+        scenario = cli._new_generated_scenario(data)
+        scenario.config["max_steps"] = -1
+
+        assert data["config"]["max_steps"] == 5
+
+
+class TestSchema:
+    """Tests for CLI schema creation"""
+
+    def test_create_missing_tables(self):
+        """Test that tables are created once and create_all is skipped afterwards"""
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            cli._create_missing_tables(conn)
+            assert set(inspect(conn).get_table_names()) >= set(Base.metadata.tables)
+
+            with patch.object(Base.metadata, "create_all") as create_all:
+                cli._create_missing_tables(conn)
+            create_all.assert_not_called()
+
+    def test_create_missing_indexes(self):
+        """Test that an index declared after its table was created is added"""
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            cli._create_missing_tables(conn)
+            conn.execute(text("DROP INDEX ix_scenarios_name"))
+
+            with patch.object(Base.metadata, "create_all") as create_all:
+                cli._create_missing_tables(conn)
+            create_all.assert_not_called()
+            assert "ix_scenarios_name" in {index["name"] for index in inspect(conn).get_indexes("scenarios")}
+
+
+class TestLiveDisplay:
+    """Tests for the live display redraw loop, on a clock the test moves by hand"""
+
+    @staticmethod
+    async def _turns(n=10):
+        """Let the event loop run n times"""
+        for _ in range(n):
+            await asyncio.sleep(0)
+
+    def _start(self, renderer, live):
+        """Drive the display until the returned event is set, reading self.now as the clock"""
+        self.now = 100.0
+        done = asyncio.Event()
+        task = asyncio.create_task(done.wait())
+        driver = asyncio.create_task(
+            cli._drive_live_display(live, renderer, task, clock=lambda: self.now)
+        )
+        return done, driver
+
+    @pytest.mark.parametrize("ticks, draws", [(0.5, 0), (1, 1)])
+    async def test_redraws_only_when_dirty(self, ticks, draws):
+        """Test that an idle renderer is only redrawn once the idle tick has passed"""
+        live = MagicMock()
+        renderer = EventRenderer(MagicMock())
+        renderer.consume_dirty()
+        done, driver = self._start(renderer, live)
+
+        await self._turns()
+        assert live.update.call_count == 0
+
+        self.now += cli._LIVE_TICK * ticks
+        done.set()
+        await driver
+        assert live.update.call_count == draws
+
+    async def test_wakes_on_update(self):
+        """Test that new data is drawn without waiting for the idle tick, once per burst"""
+        live = MagicMock()
+        renderer = EventRenderer(MagicMock())
+        renderer.consume_dirty()
+        done, driver = self._start(renderer, live)
+        await self._turns()
+
+        self.now += cli._LIVE_MIN_INTERVAL
+        for _ in range(3):
+            renderer.update_stream("a1", "token ")
+        await self._turns()
+        assert live.update.call_count == 1
+
+        done.set()
+        await driver
+        assert live.update.call_count == 1
+
+
+class FakeWebSocket:
+    """Async iterator over canned frames, optionally failing at the end"""
+
+    def __init__(self, frames, error=None):
+        self.frames = frames
+        self.error = error
+
+    async def __aiter__(self):
+        for frame in self.frames:
+            yield frame
+        if self.error:
+            raise self.error
+
+
+class TestRenderWsEvents:
+    """Tests for feeding monitor frames to the live display"""
+
+    async def test_events_are_applied_in_batches(self):
+        """Test that queued events reach the renderer and redraws happen per batch"""
+        frames = ['{"event":"ping","data":{}}', b'{"event": "pong"}', "not json", b"\x00"] + [
+            json.dumps({"event": "step_completed", "data": {"step": step, "messages": [{"content": "hi"}]}})
+            for step in range(1, 41)
+        ] + [json.dumps({"event": "run_stopped", "data": {}}).encode()]
+        renderer = EventRenderer(MagicMock())
+        live = MagicMock()
+
+        with patch.object(cli.asyncio, "sleep", AsyncMock()):
+            await cli._render_ws_events(FakeWebSocket(frames), renderer, live)
+
+        assert renderer.current_step == 40
+        assert renderer.run_status == "stopped"
+        assert (renderer.total_events, renderer.total_messages) == (41, 40)
+        assert live.update.call_count < 41
+
+    async def test_reader_errors_propagate(self):
+        """Test that a failed connection ends monitoring with its error"""
+        ws = FakeWebSocket([json.dumps({"event": "run_started", "data": {}})], error=ConnectionError("closed"))
+
+        with pytest.raises(ConnectionError):
+            await cli._render_ws_events(ws, EventRenderer(MagicMock()), MagicMock())
+
+
+class TestHealthUrl:
+    """Tests for deriving the health endpoint from a websocket URL"""
+
+    def test_ws_url(self):
+        """Test that ws URLs map to plain HTTP on the same host"""
+        assert _health_url_for("ws://localhost:8000/api/ws") == "http://localhost:8000/health"
+
+    def test_wss_url(self):
+        """Test that wss URLs map to HTTPS"""
+        assert _health_url_for("wss://example.com/api/ws") == "https://example.com/health"
+
+
+class TestResolveScenario:
+    """Tests for looking up a saved scenario by id or name"""
+
+    async def test_resolve_scenario(self, db_session):
+        """Test id, exact and partial lookups, preferring exact names"""
+        rows = [
+            Scenario(name=name, description="", config={}, agent_templates=[])
+            for name in ("Flood Drill", "Flood", "Quake")
+        ]
+        db_session.add_all(rows)
+        await db_session.commit()
+
+        assert (await cli._resolve_scenario(db_session, rows[2].id)) is rows[2]
+        assert (await cli._resolve_scenario(db_session, "flood")).name == "Flood"
+        assert (await cli._resolve_scenario(db_session, "Flood")).name == "Flood"
+        assert (await cli._resolve_scenario(db_session, "drill")).name == "Flood Drill"
+        assert await cli._resolve_scenario(db_session, "storm") is None
+
+
+class TestBestRuns:
+    """Tests for the best runs ranking"""
+
+    async def test_ranking_in_sql(self, db_session):
+        """Test that completed runs rank by health minus stress, missing metrics last"""
+        scenario = Scenario(name="Quake", description="", config={}, agent_templates=[])
+        db_session.add(scenario)
+        await db_session.flush()
+        metrics = [
+            {"avg_health": 6, "avg_stress": 5},
+            {"avg_health": 9, "avg_stress": 1},
+            {},
+            {"avg_health": 7, "avg_stress": 2},
+        ]
+        db_session.add_all(
+            Run(scenario_id=scenario.id, status=RunStatus.COMPLETED, metrics=m, current_step=i)
+            for i, m in enumerate(metrics)
+        )
+        db_session.add(Run(scenario_id=scenario.id, status=RunStatus.FAILED, metrics={"avg_health": 10, "avg_stress": 0}))
+        await db_session.commit()
+
+        @asynccontextmanager
+        async def session():
+            yield db_session
+
+        console = Console(width=120, record=True)
+        with patch.object(cli, "_db_session", session), patch.object(cli, "console", console):
+            await cli._show_best_runs(3)
+
+        rows = [line for line in console.export_text().splitlines() if "Quake" in line]
+        assert [row.split("│")[4].strip() for row in rows] == ["8.00", "5.00", "1.00"]
+
+
+class TestCreatePresetRun:
+    """Tests for the auto loop's own runs"""
+
+    async def test_stale_cache_entry_is_replaced(self, db_session):
+        """Test that a cached scenario deleted since is recreated instead of referenced"""
+        name = next(iter(DEFAULT_SCENARIOS))
+        with patch.dict(cli._PRESET_SCENARIO_CACHE, {name: ("deleted-id", name, 5)}):
+            run_id, scenario_name = await cli._create_preset_run(db_session, name)
+            cached_id = cli._PRESET_SCENARIO_CACHE[name][0]
+
+        run = await db_session.get(Run, run_id)
+        assert scenario_name == name
+        assert run.status == RunStatus.RUNNING
+        assert run.scenario_id == cached_id != "deleted-id"
+        assert (await db_session.get(Scenario, cached_id)).name == name
+
+
+class TestClaimPendingRuns:
+    """Tests for the auto loop claiming queued runs"""
+
+    async def test_claims_oldest_first_once(self, db_session):
+        """Test that a claim moves pending runs to RUNNING so they are only handed out once"""
+        scenario = Scenario(name="Quake", description="", config={}, agent_templates=[])
+        db_session.add(scenario)
+        await db_session.flush()
+        runs = [
+            Run(scenario_id=scenario.id, status=RunStatus.PENDING, created_at=datetime(2024, 1, day))
+            for day in (3, 1, 2)
+        ]
+        db_session.add_all(runs)
+        db_session.add(Run(scenario_id=scenario.id, status=RunStatus.COMPLETED))
+        await db_session.commit()
+
+        claimed = await cli._claim_pending_runs(db_session)
+
+        assert claimed == [(runs[i].id, "Quake") for i in (1, 2, 0)]
+        assert await cli._claim_pending_runs(db_session) == []
+        statuses = await db_session.scalars(select(Run.status).where(Run.id.in_(r.id for r in runs)))
+        assert set(statuses) == {RunStatus.RUNNING}
+
+    async def test_lost_claim_is_skipped(self, db_session):
+        """Test that a claimed run changed elsewhere in the meantime is not executed"""
+        scenario = Scenario(name="Quake", description="", config={}, agent_templates=[])
+        db_session.add(scenario)
+        await db_session.flush()
+        run = Run(scenario_id=scenario.id, status=RunStatus.PENDING)
+        db_session.add(run)
+        await db_session.commit()
+        [(run_id, _)] = await cli._claim_pending_runs(db_session)
+        # Another process resumed the run and has already taken steps
+        await db_session.execute(update(Run).values(current_step=3))
+        await db_session.commit()
+
+        with patch("app.simulation.engine.SimulationEngine") as engine, \
+                patch.object(cli, "console", Console(record=True)):
+            await cli._execute_existing_run(db_session, run_id, simple=False, claimed=True)
+
+        engine.assert_not_called()
+
+    @staticmethod
+    async def _add_pending_runs(db_session, n):
+        """Add n PENDING runs, oldest first, returning their ids"""
+        scenario = Scenario(name="Quake", description="", config={}, agent_templates=[])
+        db_session.add(scenario)
+        await db_session.flush()
+        runs = [
+            Run(scenario_id=scenario.id, status=RunStatus.PENDING, created_at=datetime(2024, 1, day))
+            for day in range(1, n + 1)
+        ]
+        db_session.add_all(runs)
+        await db_session.commit()
+        return [run.id for run in runs]
+
+    @staticmethod
+    async def _statuses(db_session, run_ids):
+        """Current status of each run, by id"""
+        result = await db_session.execute(select(Run.id, Run.status).where(Run.id.in_(run_ids)))
+        return dict(result.all())
+
+    async def test_count_limits_claims(self, db_session):
+        """Test that a counted loop only claims the runs it will execute"""
+        run_ids = await self._add_pending_runs(db_session, 3)
+
+        class FakeEngine:
+            def __init__(self, run_id, db_session, on_event):
+                self.agents = {}
+                self.max_steps = None
+
+            async def initialize(self, config):
+                pass
+
+            async def start(self, stream_callback=None):
+                pass
+
+        with patch("app.simulation.engine.SimulationEngine", FakeEngine), \
+                patch.object(cli, "_claim_pending_runs", wraps=cli._claim_pending_runs) as claim, \
+                patch.object(cli, "console", Console(record=True)):
+            await cli._run_auto_cycles(db_session, 1, None)
+
+        claim.assert_awaited_once_with(db_session, 1)
+        statuses = await self._statuses(db_session, run_ids)
+        assert statuses[run_ids[0]] == RunStatus.RUNNING
+        assert [statuses[run_id] for run_id in run_ids[1:]] == [RunStatus.PENDING] * 2
+
+    async def test_no_prefetch_on_last_cycle(self, db_session):
+        """Test that only runs with another cycle after them prefetch"""
+        run_ids = await self._add_pending_runs(db_session, 2)
+        # The second run is what the prefetch claims
+        await db_session.execute(update(Run).where(Run.id == run_ids[1]).values(status=RunStatus.RUNNING))
+        await db_session.commit()
+        claimed = [(run_ids[1], "Quake")]
+
+        class FakeEngine:
+            def __init__(self, run_id, db_session, on_event):
+                self.on_event = on_event
+                self.agents = {}
+                self.max_steps = 2
+
+            async def initialize(self, config):
+                pass
+
+            async def start(self, stream_callback=None):
+                for step in range(1, self.max_steps + 1):
+                    self.on_event("step_completed", {"step": step})
+
+        with patch("app.simulation.engine.SimulationEngine", FakeEngine), \
+                patch.object(cli, "_prefetch_pending_runs", AsyncMock(return_value=claimed)) as prefetch, \
+                patch.object(cli, "console", Console(record=True)):
+            await cli._run_auto_cycles(db_session, 2, None)
+
+        prefetch.assert_awaited_once_with(1)
+
+    async def test_queued_claims_are_released(self, db_session):
+        """Test that claimed runs still queued when the loop is interrupted go back to PENDING"""
+        run_ids = await self._add_pending_runs(db_session, 3)
+
+        class FakeEngine:
+            def __init__(self, run_id, db_session, on_event):
+                self.agents = {}
+
+            async def initialize(self, config):
+                raise asyncio.CancelledError
+
+        with patch("app.simulation.engine.SimulationEngine", FakeEngine), \
+                patch.object(cli, "console", Console(record=True)), \
+                pytest.raises(asyncio.CancelledError):
+            await cli._run_auto_cycles(db_session, None, None)
+
+        statuses = await self._statuses(db_session, run_ids)
+        assert [statuses[run_id] for run_id in run_ids[1:]] == [RunStatus.PENDING] * 2
+
+    async def test_on_last_step_fires_once(self, db_session):
+        """Test that the last-step hook runs once, as the final step starts"""
+        scenario = Scenario(name="Quake", description="", config={}, agent_templates=[])
+        db_session.add(scenario)
+        await db_session.flush()
+        run = Run(scenario_id=scenario.id, status=RunStatus.RUNNING, max_steps=3)
+        db_session.add(run)
+        await db_session.commit()
+        calls = []
+
+        class FakeEngine:
+            def __init__(self, run_id, db_session, on_event):
+                self.on_event = on_event
+                self.agents = {}
+                self.max_steps = None
+
+            async def initialize(self, config):
+                self.max_steps = config["config"]["max_steps"]
+
+            async def start(self):
+                for step in range(1, self.max_steps + 1):
+                    calls.append(step)
+                    self.on_event("step_completed", {"step": step})
+
+        with patch("app.simulation.engine.SimulationEngine", FakeEngine), \
+                patch.object(cli, "SimpleEventLogger", MagicMock()), \
+                patch.object(cli, "console", Console(record=True)):
+            await cli._execute_existing_run(
+                db_session, run.id, claimed=True, on_last_step=lambda: calls.append("prefetch")
+            )
+
+        assert calls == [1, 2, "prefetch", 3]
+
+
+class TestAskIndex:
+    """Tests for numbered menu prompts"""
+
+    async def test_reasks_until_in_range(self):
+        """Test that out-of-range numbers are rejected and the pick is 0-based"""
+        with patch.object(cli.IntPrompt, "ask", side_effect=[0, 4, 2]) as ask, \
+                patch.object(cli, "console", Console(record=True)) as console:
+            assert await cli._ask_index("Select scenario", 3) == 1
+
+        assert ask.call_count == 3
+        assert console.export_text().count("from 1 to 3") == 2
+
+    async def test_prompt_does_not_block_loop(self):
+        """Test that background tasks run while a prompt waits for input"""
+        background_done = threading.Event()
+        background = asyncio.create_task(asyncio.sleep(0.01))
+        background.add_done_callback(lambda _: background_done.set())
+
+        # The prompt only answers once the event loop has finished the background task
+        with patch.object(cli.Confirm, "ask", side_effect=lambda *a, **k: background_done.wait(1)):
+            assert await cli._ask(cli.Confirm, "Start?") is True
+
+    async def test_prompt_errors_propagate(self):
+        """Test that an aborted prompt raises in the awaiting coroutine"""
+        with patch.object(cli.Prompt, "ask", side_effect=EOFError):
+            with pytest.raises(EOFError):
+                await cli._ask(cli.Prompt, "Max steps")
+
+
+class TestModelCheck:
+    """Tests for check_model_selection"""
+
+    async def test_model_list_is_cached(self):
+        """Test that a recent Ollama model listing is reused"""
+        model = get_settings().ollama_default_model
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"models": [{"name": model}]}
+        client = MagicMock()
+        client.get = AsyncMock(return_value=response)
+
+        with patch.object(cli, "_get_http_client", return_value=client), \
+                patch.object(cli, "_model_list_cache", None):
+            await cli.check_model_selection()
+            await cli.check_model_selection()
+
+        assert client.get.await_count == 1
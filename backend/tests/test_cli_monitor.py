@@ -0,0 +1,229 @@
+"""Tests for the CLI event renderer"""
+import time
+from unittest.mock import patch
+
+import pytest
+from rich.console import Console
+
+from app.cli_monitor import EventRenderer, SimpleEventLogger, _now_hms, _now_hms_ms
+
+
+@pytest.fixture
+def renderer():
+    """Renderer writing to a fixed-width console"""
+    return EventRenderer(Console(width=120, height=60, record=True))
+
+
+class TestEventRenderer:
+    """Test cases for EventRenderer"""
+
+    def test_events_are_capped(self):
+        """Test that only the last max_events events are kept"""
+        renderer = EventRenderer(Console(width=120), max_events=5)
+
+        for step in range(12):
+            renderer.add_event("step_completed", {"step": step})
+
+        assert len(renderer.events) == 5
+        assert [e["data"]["step"] for e in renderer.events] == [7, 8, 9, 10, 11]
+        assert renderer.current_step == 11
+
+    def test_messages_share_event_buffer(self):
+        """Test that messages are capped together with events"""
+        renderer = EventRenderer(Console(width=120), max_events=3)
+
+        renderer.add_event("run_started", {"step": 0})
+        for i in range(3):
+            renderer.add_message({"from_agent": "a1", "content": f"msg {i}"})
+
+        assert len(renderer.events) == 3
+        assert all(e["type"] == "message" for e in renderer.events)
+        assert (renderer.total_events, renderer.total_messages) == (1, 3)
+
+    @pytest.mark.parametrize("event_type, data, expected", [
+        ("step_completed", {"step": 4}, "STEP_COMPLETED Step 4"),
+        ("agent_moved", {"agent_id": "abcdef123456", "agent_name": "Ann", "from": "Lobby", "to": "Roof"},
+         "AGENT_MOVED Ann (abcdef12): Lobby → Roof"),
+        ("agent_error", {"agent_id": "a1", "error": "timeout", "context": "tick"}, "AGENT_ERROR a1 (a1): timeout [tick]"),
+        ("run_paused", {"step": 9}, "RUN_PAUSED (step 9)"),
+    ])
+    def test_format_event(self, renderer, event_type, data, expected):
+        """Test per-type event details and the step fallback for other events"""
+        text = renderer._format_event({"type": event_type, "data": data, "timestamp": "12:00:00"})
+        assert text.plain.endswith(expected)
+
+    def test_last_actions(self):
+        """Test that each agent's latest action is tracked beyond the event buffer"""
+        renderer = EventRenderer(Console(width=120), max_events=2)
+
+        renderer.add_event("agent_moved", {"agent_id": "a1", "to": "Roof"})
+        renderer.add_message({"from_agent": "a2", "content": "Hi", "message_type": "broadcast"})
+        for step in range(3):
+            renderer.add_event("step_completed", {"step": step})
+        renderer.add_message({"from_agent_id": "a2", "from_agent": "Bo", "content": "Bye"})
+
+        assert renderer.last_actions == {"a1": "Moved to Roof", "a2": "Msg (direct)"}
+
+    def test_render_layout(self, renderer):
+        """Test that a full layout renders with recent events"""
+        renderer.add_event("step_completed", {"step": 3, "world_state": {"hazard_level": 4}})
+        renderer.add_message({"from_agent": "a1", "content": "Hello [ctx:42]", "message_type": "broadcast"})
+
+        renderer.console.print(renderer.render_layout())
+        output = renderer.console.export_text()
+
+        assert "STEP_COMPLETED" in output
+        assert '"Hello"' in output
+        assert "4/10" in output
+        assert "1 events, 1 messages" in output
+
+    def test_layout_is_reused(self, renderer):
+        """Test that render_layout refreshes one layout instead of rebuilding it"""
+        first = renderer.render_layout()
+        renderer.add_event("step_completed", {"step": 7})
+
+        assert renderer.render_layout() is first
+
+        renderer.console.print(first)
+        assert "Step 7" in renderer.console.export_text()
+
+    def test_panels_render_once_per_layout(self, renderer):
+        """Test that a stale panel is built once per render_layout call"""
+        renderer.add_event("step_completed", {"step": 1, "conversations": [{"location": "Lobby"}]})
+
+        with patch.object(renderer, "render_conversations", wraps=renderer.render_conversations) as render:
+            renderer.render_layout()
+        assert render.call_count == 1
+
+    def test_world_panel_survives_other_events(self, renderer):
+        """Test that events which don't touch the world leave its panel as built"""
+        renderer.add_event("step_completed", {"step": 1, "world_state": {"hazard_level": 4}})
+        renderer.render_layout()
+
+        with patch.object(renderer, "render_world_state") as render_world, \
+                patch.object(renderer, "render_agents", wraps=renderer.render_agents) as render_agents:
+            renderer.add_event("agent_moved", {"agent_id": "a1", "to": "Roof"})
+            renderer.render_layout()
+        render_world.assert_not_called()
+        assert render_agents.call_count == 1
+
+    def test_empty_panels_are_shared(self, renderer):
+        """Test that idle renders reuse the placeholder panels"""
+        assert renderer.render_active_stream() is EventRenderer().render_active_stream()
+        assert renderer.render_event_log() is EventRenderer().render_event_log()
+
+        renderer.console.print(renderer.render_layout())
+        output = renderer.console.export_text()
+        assert "Waiting for agent activity..." in output
+        assert "0 events, 0 messages" in output
+
+    def test_dirty_flag(self, renderer):
+        """Test that state changes mark the renderer dirty until consumed"""
+        assert renderer.consume_dirty()
+        assert not renderer.consume_dirty()
+
+        renderer.update_stream("a1", "Hello")
+        assert renderer.consume_dirty()
+        assert not renderer.consume_dirty()
+
+        renderer.add_event("step_completed", {"step": 1})
+        renderer.add_message({"from_agent": "a1", "content": "Hi"})
+        assert renderer.consume_dirty()
+
+    def test_stream_tokens_are_batched(self, renderer):
+        """Test that queued tokens apply on flush, resetting when the agent changes"""
+        for token in ("Hel", "lo"):
+            renderer.update_stream("a1", token)
+        assert renderer.current_stream_text == ""
+
+        renderer.flush_streams()
+        assert renderer.current_stream_text == "Hello"
+        assert renderer.current_stream_token_count == 2
+
+        renderer.update_stream("a1", "!")
+        renderer.update_stream("a2", "x" * 1200)
+        renderer.render_layout()
+        assert renderer.current_stream_agent == "a2"
+        assert renderer.current_stream_text == "..." + "x" * 997
+        assert renderer.current_stream_token_count == 1
+
+    def test_active_streams(self, renderer):
+        """Test that streams are ordered most recent first and capped"""
+        renderer.agents = {"a1": {"name": "Ann"}}
+        for agent_id in ("a1", "a2", "a3", "a1", "a4"):
+            renderer.update_stream(agent_id, f"from {agent_id}")
+            renderer.flush_streams()
+
+        streams = list(renderer._active_streams.values())
+        assert [stream["id"] for stream in streams] == ["a4", "a1", "a3"]
+        assert (streams[1]["name"], streams[1]["text"]) == ("Ann", "from a1")
+
+        renderer.console.print(renderer.render_active_stream())
+        output = renderer.console.export_text()
+        assert "from a4" in output and "from a2" not in output
+
+    def test_unchanged_panels_are_kept(self, renderer):
+        """Test that panels are only rebuilt after the state they show changes"""
+        layout = renderer.render_layout()
+        events_panel = layout["events"].renderable
+        header_panel = layout["header"].renderable
+
+        renderer.update_stream("a1", "Hello")
+        renderer.render_layout()
+        assert layout["events"].renderable is events_panel
+
+        renderer.add_message({"from_agent": "a1", "content": "Hi"})
+        renderer.render_layout()
+        assert layout["events"].renderable is not events_panel
+        assert layout["header"].renderable is header_panel
+
+        renderer.add_event("step_completed", {"step": 2})
+        renderer.render_layout()
+        assert layout["header"].renderable is not header_panel
+
+    def test_world_clock_is_drawn_live(self, renderer):
+        """Test that the cached world panel still shows the time it is drawn at"""
+        layout = renderer.render_layout()
+        world_panel = layout["world"].renderable
+
+        renderer.update_stream("a1", "Hello")
+        renderer.render_layout()
+        assert layout["world"].renderable is world_panel
+
+        with patch("app.cli_monitor._now_hms", return_value="23:59:58"):
+            renderer.console.print(world_panel)
+        assert "23:59:58" in renderer.console.export_text()
+
+
+class TestTimestamps:
+    """Test cases for the cached wall-clock timestamps"""
+
+    def test_matches_strftime(self):
+        """Test that cached and millisecond timestamps match the local time"""
+        now = time.time()
+        second = time.strftime("%H:%M:%S", time.localtime(int(now)))
+
+        assert _now_hms(now) == second
+        assert _now_hms(now + 0.001) == second
+        assert _now_hms(now + 1) == time.strftime("%H:%M:%S", time.localtime(int(now) + 1))
+        with patch("app.cli_monitor.time.time", return_value=int(now) + 0.25):
+            assert _now_hms_ms() == f"{second}.250"
+
+
+class TestSimpleEventLogger:
+    """Test cases for SimpleEventLogger"""
+
+    @pytest.mark.parametrize("fast", [False, True])
+    def test_model_output_is_not_markup(self, fast):
+        """Test that names and content containing markup-like tags are printed as is"""
+        console = Console(width=120, record=True)
+        logger = SimpleEventLogger(console, fast=fast)
+
+        logger.log_event("agent_error", {"agent_id": "a1", "agent_name": "[/bold]Bob", "error": "bad [red]"})
+        logger.log_message({"from_agent_name": "Al[/x]", "content": "hi [b]", "message_type": "conversation"})
+        logger.log_token("a1", "[/i]", "Ann")
+        output = console.export_text()
+
+        assert "agent=[/bold]Bob (a1) error: bad [red]" in output
+        assert 'Al[/x]: "hi [b]"' in output
+        assert "Ann: [/i]" in output
@@ -0,0 +1,32 @@
+"""Tests for the JSON column encoding"""
+import json
+import math
+
+import pytest
+
+from app.core.database import json_deserializer, json_serializer
+
+
+class TestJsonColumns:
+    """Tests for json_serializer and json_deserializer"""
+
+    @pytest.mark.parametrize("value", [
+        {"hazard_level": 4, "agents": {"a1": {"health": 7.5, "notes": None}}},
+        {1: "a", "b": [1, 2.0, None, True]},
+        {"seed": 2**70, "scores": [-(2**64)]},
+    ])
+    def test_round_trip(self, value):
+        """Test that values round-trip and encode as json.dumps would"""
+        encoded = json_serializer(value)
+
+        assert json.loads(encoded) == json.loads(json.dumps(value))
+        assert json_deserializer(encoded) == json.loads(json.dumps(value))
+
+    def test_non_finite_floats_are_kept(self):
+        """Test that NaN and infinities are stored as such rather than as null"""
+        value = {"avg_stress": float("nan"), "bounds": [float("-inf"), float("inf"), None]}
+
+        decoded = json_deserializer(json_serializer(value))
+
+        assert math.isnan(decoded["avg_stress"])
+        assert decoded["bounds"] == [float("-inf"), float("inf"), None]
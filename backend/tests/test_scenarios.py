@@ -1,9 +1,13 @@
 """Tests for the scenario configurations"""
+import json
+from unittest.mock import patch
+
 import pytest
 
 from app.scenarios.rising_flood import create_rising_flood_scenario, get_rising_flood_config
 from app.scenarios.airplane_crash import create_airplane_crash_scenario, get_airplane_crash_config
 from app.scenarios.mass_casualty import create_mass_casualty_scenario, get_mass_casualty_config
+from app.scenarios import storage
 
 
 class TestRisingFloodScenario:
@@ -265,3 +269,25 @@ class TestScenarioCompatibility:
                 f"Not all locations reachable in {scenario.name}: {all_locations - reachable}"
 
 
+class TestGeneratedScenarioStorage:
+    """Test cases for loading generated scenario files"""
+
+    def test_load_generated_scenarios(self, tmp_path):
+        """Test that valid files load newest first and invalid ones are skipped"""
+        for name, generated_at in (("Old", "2024-01-01"), ("New", "2024-06-01")):
+            (tmp_path / f"{name}.json").write_text(json.dumps({
+                "name": name,
+                "generated_at": generated_at,
+                "config": {},
+                "agent_templates": [{"role": "human"}, {"role": "environment"}],
+            }))
+        (tmp_path / "broken.json").write_bytes(b"{not json")
+        (tmp_path / "latin1.json").write_bytes(b'{"name": "\xe9"}')
+        (tmp_path / "partial.json").write_text(json.dumps({"name": "No agents"}))
+
+        with patch.object(storage, "SCENARIOS_DIR", tmp_path):
+            scenarios = storage.load_generated_scenarios()
+
+        assert [s["name"] for s in scenarios] == ["New", "Old"]
+        assert scenarios[0]["agent_count"] == 2
+        assert scenarios[0]["persona_count"] == 1